@@ -0,0 +1,97 @@
+"""Per-request cost of the rate limiter.
+
+Calls a limited route function directly, so only the limiter is measured: keyed
+by client address, by a bearer token, and with slowapi's decorator, which the
+limiter replaced, if it is installed. Limits are set high enough that no call
+is denied. Run from the repository root with the usual settings in the
+environment:
+
+    DB_PASSWORD=x DB_HOST=x python benchmarks/limiter.py [calls]
+"""
+
+import asyncio
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fastapi import Request  # noqa: E402
+from starlette.responses import Response  # noqa: E402
+
+from auth.utils import create_access_token  # noqa: E402
+from core.limiter import Limiter, MemoryStorage, get_user_key  # noqa: E402
+
+REPEAT = 5
+LIMIT = "1000000000/minute"
+
+
+def make_request(headers: Optional[Dict[str, str]] = None) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/",
+            "headers": [
+                (k.lower().encode(), v.encode()) for k, v in (headers or {}).items()
+            ],
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+async def route(request: Request, response: Response) -> str:
+    return "ok"
+
+
+def slowapi_route() -> Optional[Callable[..., Awaitable]]:
+    try:
+        from slowapi import Limiter as SlowapiLimiter
+        from slowapi.util import get_remote_address
+    except ImportError:
+        return None
+    return SlowapiLimiter(key_func=get_remote_address).limit(LIMIT)(route)
+
+
+def measure(
+    func: Callable[..., Awaitable], headers: Optional[Dict[str, str]], calls: int
+) -> float:
+    async def run() -> float:
+        # A request per call, as slowapi marks a request once it has been checked
+        # and skips the check when it comes again
+        requests = [make_request(headers) for _ in range(calls)]
+        response = Response()
+        start = time.perf_counter()
+        for request in requests:
+            await func(request=request, response=response)
+        return time.perf_counter() - start
+
+    return min(asyncio.run(run()) for _ in range(REPEAT)) / calls
+
+
+def main(calls: int) -> None:
+    limiter = Limiter(key_func=get_user_key, storage=MemoryStorage(100_000))
+    limited = limiter.limit(LIMIT)(route)
+    token = create_access_token({"sub": "bench"}, timedelta(minutes=30))
+    by_address = None
+    by_token = {"Authorization": f"Bearer {token}"}
+
+    print(f"{calls} calls, best of {REPEAT}, per call:")
+    baseline = measure(route, by_address, calls)
+    print(f"  unlimited        {baseline * 1e6:8.2f} us")
+    for name, func, headers in [
+        ("limiter, address", limited, by_address),
+        ("limiter, token", limited, by_token),
+        ("slowapi, address", slowapi_route(), by_address),
+    ]:
+        if func is None:
+            print(f"  {name:16} not installed")
+            continue
+        took = measure(func, headers, calls)
+        print(f"  {name:16} {took * 1e6:8.2f} us  (+{(took - baseline) * 1e6:.2f})")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
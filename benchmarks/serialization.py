@@ -0,0 +1,116 @@
+"""Per-row cost of turning a page of refills into a response body.
+
+Compares the default path, loading ORM objects and validating them into
+schemas which FastAPI then checks and serializes, with the `fast_json` one,
+serializing the selected rows as they are. An in-memory SQLite database stands
+in for Postgres so only the Python side is measured. Run from the repository
+root with the usual settings in the environment:
+
+    DB_PASSWORD=x DB_HOST=x python benchmarks/serialization.py [rows]
+"""
+
+import asyncio
+import inspect
+import sys
+import time
+import warnings
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Callable, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fastapi import Response  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+from sqlalchemy import Engine, create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import models  # noqa: E402
+from core.responses import rows_response  # noqa: E402
+from schemas import Refill  # noqa: E402
+
+REPEAT = 5
+
+response_field = create_model_field("Response", List[Refill], mode="serialization")
+# Recent FastAPI dumps JSON in pydantic-core, older versions go through a dict
+DUMP_JSON = "dump_json" in inspect.signature(serialize_response).parameters
+
+
+def setup(rows: int) -> Engine:
+    engine = create_engine("sqlite://")
+    models.Base.metadata.create_all(engine, tables=[models.Refill.__table__])
+    start = date(2020, 1, 1)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(models.Refill),
+            [
+                {
+                    "id": i,
+                    "fill_date": start + timedelta(days=i % 2000),
+                    "odometer": i * 35.0,
+                    "liters_filled": 35.2,
+                    "brand_id": i % 5 + 1,
+                    "octane_id": i % 3 + 1,
+                    "ethanol_percent": 0.1,
+                    "cost": 1750.5,
+                }
+                for i in range(1, rows + 1)
+            ],
+        )
+    return engine
+
+
+def current(engine: Engine) -> bytes:
+    with Session(engine) as session:
+        stmt = select(models.Refill).order_by(models.Refill.id)
+        db_refills = session.scalars(stmt).all()
+        # The crud layer validates, then FastAPI checks against the response model
+        items = [Refill.model_validate(db_refill) for db_refill in db_refills]
+    if DUMP_JSON:
+        return asyncio.run(
+            serialize_response(
+                field=response_field, response_content=items, dump_json=True
+            )
+        )
+    content = asyncio.run(
+        serialize_response(field=response_field, response_content=items)
+    )
+    return JSONResponse(content).body
+
+
+def fast(engine: Engine) -> bytes:
+    table = models.Refill.__table__
+    with Session(engine) as session:
+        stmt = select(*(table.c[name] for name in Refill.model_fields)).order_by(
+            table.c.id
+        )
+        rows = session.execute(stmt).all()
+    return rows_response(rows, Refill, Response()).body
+
+
+def measure(path: Callable[[Engine], bytes], engine: Engine, rows: int) -> float:
+    best = float("inf")
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        path(engine)
+        best = min(best, time.perf_counter() - start)
+    return best / rows
+
+
+def main(rows: int) -> None:
+    # SQLite has no native decimal type, SQLAlchemy warns on reading Numeric
+    warnings.simplefilter("ignore")
+    engine = setup(rows)
+    assert current(engine) == fast(engine)
+
+    print(f"{rows} refills, best of {REPEAT}, per row:")
+    baseline = measure(current, engine, rows)
+    print(f"  current    {baseline * 1e6:8.2f} us")
+    took = measure(fast, engine, rows)
+    print(f"  fast_json  {took * 1e6:8.2f} us  ({baseline / took:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,54 @@
+from datetime import date
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core import log
+from core.limiter import limiter
+from core.pagination import Page, paginate
+from core.responses import fast_json
+from core.timing import TimedRoute
+from crud import analytics
+from database.session import get_read_session
+from schemas import Int4, RefillEconomy, RefillMonthlySummary
+
+router = APIRouter(prefix="/analytics", route_class=TimedRoute)
+
+
+@router.get("/economy", response_model=List[RefillEconomy])
+@limiter.limit("60/minute")
+async def read_economy(
+    request: Request,
+    response: Response,
+    page: Page = Depends(),
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    brand_id: Optional[Int4] = None,
+    octane_id: Optional[Int4] = None,
+    db: AsyncSession = Depends(get_read_session),
+) -> List[RefillEconomy]:
+    log.info("Computing fuel economy.")
+    result = await analytics.read_economy(
+        db, page.cursor, page.limit + 1, date_from, date_to, brand_id, octane_id
+    )
+    log.info("Computed fuel economy.")
+    items = paginate(result, page, response, key=analytics.economy_key)
+    return fast_json(items, List[RefillEconomy], response)
+
+
+@router.get("/monthly", response_model=List[RefillMonthlySummary])
+@limiter.limit("60/minute")
+async def read_monthly(
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    brand_id: Optional[Int4] = None,
+    octane_id: Optional[Int4] = None,
+    db: AsyncSession = Depends(get_read_session),
+) -> List[RefillMonthlySummary]:
+    log.info("Reading monthly refill totals.")
+    result = await analytics.read_monthly(db, date_from, date_to, brand_id, octane_id)
+    log.info("Read monthly refill totals.")
+    return fast_json(result, List[RefillMonthlySummary], response)
@@ -1,15 +1,19 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request
-from loguru import logger
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import log
+from core.batch import parse_ids, report_missing
 from core.limiter import limiter
+from core.pagination import Page, paginate
+from core.responses import fast_json
+from core.timing import TimedRoute
 from crud import brands
 from database.session import get_db_session
 from schemas import Brand, BrandCreate, BrandUpdate
 
-router = APIRouter(prefix="/brands")
+router = APIRouter(prefix="/brands", route_class=TimedRoute)
 
 
 @router.post("/", response_model=Brand)
@@ -17,9 +21,9 @@ router = APIRouter(prefix="/brands")
 async def create_brand(
     request: Request, params: BrandCreate, db: AsyncSession = Depends(get_db_session)
 ) -> Brand:
-    logger.info(f"Creating brand: {params}.")
+    log.info("Creating brand: {}.", params)
     result = await brands.create_brand(params, db)
-    logger.info(f"Created brand: {result}.")
+    log.info("Created brand: {}.", result)
     return result
 
 
@@ -28,21 +32,31 @@ async def create_brand(
 async def read_brand(
     request: Request, id: int, db: AsyncSession = Depends(get_db_session)
 ) -> Brand:
-    logger.info(f"Fetching brand with id: {id}.")
+    log.info("Fetching brand with id: {}.", id)
     result = await brands.read_brand(id, db)
-    logger.info(f"Fetched brand: {result}.")
+    log.info("Fetched brand: {}.", result)
     return result
 
 
 @router.get("/", response_model=List[Brand])
 @limiter.limit("60/minute")
 async def read_brands(
-    request: Request, db: AsyncSession = Depends(get_db_session)
+    request: Request,
+    response: Response,
+    page: Page = Depends(),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    db: AsyncSession = Depends(get_db_session),
 ) -> List[Brand]:
-    logger.info("Fetching all brands.")
-    result = await brands.read_brands(db)
-    logger.info("Fetched all brands.")
-    return result
+    if ids is not None:
+        log.info("Fetching brands with ids: {}.", ids)
+        result = await brands.read_brands_by_ids(ids, db)
+        log.info("Fetched {} of {} brands.", len(result), len(ids))
+        return fast_json(report_missing(ids, result, response), List[Brand], response)
+
+    log.info("Fetching all brands.")
+    result = await brands.read_brands(db, page.after, page.limit + 1)
+    log.info("Fetched all brands.")
+    return fast_json(paginate(result, page, response), List[Brand], response)
 
 
 @router.put("/{id}", response_model=Brand)
@@ -53,9 +67,9 @@ async def update_brand(
     params: BrandUpdate,
     db: AsyncSession = Depends(get_db_session),
 ) -> Brand:
-    logger.info(f"Updating brand with id: {id}.")
+    log.info("Updating brand with id: {}.", id)
     result = await brands.update_brand(id, params, db)
-    logger.info(f"Updated brand: {result}.")
+    log.info("Updated brand: {}.", result)
     return result
 
 
@@ -64,7 +78,7 @@ async def update_brand(
 async def delete_brand(
     request: Request, id: int, db: AsyncSession = Depends(get_db_session)
 ) -> Brand:
-    logger.info(f"Deleting brand with id: {id}.")
+    log.info("Deleting brand with id: {}.", id)
     result = await brands.delete_brand(id, db)
-    logger.info(f"Deleted brand: {result}.")
+    log.info("Deleted brand: {}.", result)
     return result
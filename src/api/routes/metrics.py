@@ -0,0 +1,184 @@
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, Response
+
+from auth.services import login_latency
+from auth.utils import password_executor
+from config.settings import settings
+from core.cache import caches
+from core.context import request_latency
+from core.limiter import limiter
+from core.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    Family,
+    MetricsDirectory,
+    merge,
+    render,
+)
+from core.timing import timing_stats
+from database.session import sessionmanager
+from database.timing import query_latency
+
+PREFIX = "naviconomy"
+
+router = APIRouter()
+
+# Shared by the workers of a host when `metrics_dir` is set, else metrics are
+# those of the worker answering
+directory: Optional[MetricsDirectory] = (
+    MetricsDirectory(settings.metrics_dir) if settings.metrics_dir else None
+)
+
+
+def family(name: str, type: str, help: str) -> Family:
+    return Family(f"{PREFIX}_{name}", type, help)
+
+
+def collect() -> List[Family]:
+    """Collect the metrics of this process."""
+    http = family(
+        "http_request_duration_seconds", "histogram", "Latency of HTTP requests."
+    )
+    for (route, status), histogram in request_latency.items():
+        http.add_histogram(histogram.snapshot(), route=route, status=status)
+
+    phases = family(
+        "http_request_phase_seconds",
+        "histogram",
+        "Time HTTP requests spent in each phase, see Server-Timing.",
+    )
+    for route, route_phases in timing_stats().items():
+        for phase, snapshot in route_phases.items():
+            phases.add_histogram(snapshot, route=route, phase=phase)
+
+    queries = family(
+        "db_query_duration_seconds", "histogram", "Latency of database queries."
+    )
+    queries.add_histogram(query_latency.snapshot())
+
+    pool_size = family("db_pool_size", "gauge", "Connections the primary's pool keeps.")
+    pool_connections = family(
+        "db_pool_connections", "gauge", "Open connections of the primary's pool."
+    )
+    pool_waiting = family(
+        "db_pool_waiting", "gauge", "Requests waiting for a pooled connection."
+    )
+    pool_timeouts = family(
+        "db_pool_checkout_timeouts_total",
+        "counter",
+        "Checkouts that timed out waiting for a connection.",
+    )
+    pool_checkout = family(
+        "db_pool_checkout_duration_seconds",
+        "histogram",
+        "Time taken to check out a pooled connection.",
+    )
+    pool = sessionmanager.pool_stats()
+    if pool:
+        pool_size.add(pool["size"])
+        for state in ("checked_in", "checked_out"):
+            pool_connections.add(pool[state], state=state)
+        pool_waiting.add(pool["waiting"])
+        pool_timeouts.add(pool["checkout_timeouts"])
+        pool_checkout.add_histogram(pool["checkout_latency"])
+
+    logins = family("login_duration_seconds", "histogram", "Latency of logins.")
+    logins.add_histogram(login_latency.snapshot())
+
+    hashing = password_executor.stats()
+    password_hashes = family(
+        "password_hash_duration_seconds",
+        "histogram",
+        "Latency of bcrypt hashes and checks, waiting for a thread included.",
+    )
+    password_hashes.add_histogram(hashing["latency"])
+    password_rejected = family(
+        "password_hash_rejected_total",
+        "counter",
+        "bcrypt jobs refused because too many were pending.",
+    )
+    password_rejected.add(hashing["rejected"])
+
+    rate_limited = family(
+        "rate_limit_requests_total", "counter", "Rate limit decisions per route."
+    )
+    rate_fill = family(
+        "rate_limit_fill_ratio",
+        "histogram",
+        "How full the client's bucket was after each request, 1 once throttled.",
+    )
+    for route, stats in limiter.stats().items():
+        rate_limited.add(stats["allowed"], route=route, decision="allowed")
+        rate_limited.add(stats["denied"], route=route, decision="denied")
+        rate_fill.add_histogram(stats["fill"], route=route)
+
+    cache_hits = family("cache_hits_total", "counter", "Cache lookups that hit.")
+    cache_misses = family("cache_misses_total", "counter", "Cache lookups that missed.")
+    cache_entries = family("cache_entries", "gauge", "Entries held by each cache.")
+    for name, cache in caches.items():
+        stats = cache.stats()
+        cache_hits.add(stats["hits"], cache=name)
+        cache_misses.add(stats["misses"], cache=name)
+        cache_entries.add(stats["size"], cache=name)
+
+    return [
+        http,
+        phases,
+        queries,
+        pool_size,
+        pool_connections,
+        pool_waiting,
+        pool_timeouts,
+        pool_checkout,
+        logins,
+        password_hashes,
+        password_rejected,
+        rate_limited,
+        rate_fill,
+        cache_hits,
+        cache_misses,
+        cache_entries,
+    ]
+
+
+def hit_ratios(families: List[Family]) -> Family:
+    """Derive each cache's hit ratio from hits and misses summed across workers."""
+    samples = {family.name: family.samples for family in families}
+    hits = samples.get(f"{PREFIX}_cache_hits_total", {})
+    misses = samples.get(f"{PREFIX}_cache_misses_total", {})
+    ratios = family("cache_hit_ratio", "gauge", "Share of cache lookups that hit.")
+    for key, hit_count in hits.items():
+        labels = key[len(f"{PREFIX}_cache_hits_total") :]
+        lookups = hit_count + misses.get(f"{PREFIX}_cache_misses_total{labels}", 0)
+        if lookups:
+            ratios.samples[f"{ratios.name}{labels}"] = hit_count / lookups
+    return ratios
+
+
+async def write_metrics(interval: float) -> None:
+    """Write this worker's metrics to the shared directory every `interval` seconds."""
+    if directory is None:
+        return
+    try:
+        while True:
+            await asyncio.to_thread(directory.write, collect())
+            await asyncio.sleep(interval)
+    finally:
+        await asyncio.to_thread(directory.remove)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def read_metrics() -> Response:
+    """Return metrics in the Prometheus text format, summed across workers if shared.
+
+    Gauges are summed too, e.g. `db_pool_connections` counts the connections of
+    every worker's pool. The shared files are read in a thread, as another
+    worker may hold their lock.
+    """
+    families = collect()
+    if directory is not None:
+        await asyncio.to_thread(directory.write, families)
+        families = merge(await asyncio.to_thread(directory.read))
+    families.append(hit_ratios(families))
+    return Response(render(families), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,15 +1,19 @@
-from typing import List
+from typing import List, Optional
 
-from fastapi import APIRouter, Depends, Request
-from loguru import logger
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from core import log
+from core.batch import parse_ids, report_missing
 from core.limiter import limiter
+from core.pagination import Page, paginate
+from core.responses import fast_json
+from core.timing import TimedRoute
 from crud import octanes
 from database.session import get_db_session
 from schemas import Octane, OctaneCreate, OctaneUpdate
 
-router = APIRouter(prefix="/octanes")
+router = APIRouter(prefix="/octanes", route_class=TimedRoute)
 
 
 @router.post("/", response_model=Octane)
@@ -17,9 +21,9 @@ router = APIRouter(prefix="/octanes")
 async def create_octane(
     request: Request, params: OctaneCreate, db: AsyncSession = Depends(get_db_session)
 ) -> Octane:
-    logger.info(f"Creating octane: {params}.")
+    log.info("Creating octane: {}.", params)
     result = await octanes.create_octane(params, db)
-    logger.info(f"Created octane: {result}.")
+    log.info("Created octane: {}.", result)
     return result
 
 
@@ -28,21 +32,31 @@ async def create_octane(
 async def read_octane(
     request: Request, id: int, db: AsyncSession = Depends(get_db_session)
 ) -> Octane:
-    logger.info(f"Fetching octane with id: {id}.")
+    log.info("Fetching octane with id: {}.", id)
     result = await octanes.read_octane(id, db)
-    logger.info(f"Fetched octane: {result}.")
+    log.info("Fetched octane: {}.", result)
     return result
 
 
 @router.get("/", response_model=List[Octane])
 @limiter.limit("60/minute")
 async def read_octanes(
-    request: Request, db: AsyncSession = Depends(get_db_session)
+    request: Request,
+    response: Response,
+    page: Page = Depends(),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    db: AsyncSession = Depends(get_db_session),
 ) -> List[Octane]:
-    logger.info("Fetching octanes.")
-    result = await octanes.read_octanes(db)
-    logger.info("Fetched octanes.")
-    return result
+    if ids is not None:
+        log.info("Fetching octanes with ids: {}.", ids)
+        result = await octanes.read_octanes_by_ids(ids, db)
+        log.info("Fetched {} of {} octanes.", len(result), len(ids))
+        return fast_json(report_missing(ids, result, response), List[Octane], response)
+
+    log.info("Fetching octanes.")
+    result = await octanes.read_octanes(db, page.after, page.limit + 1)
+    log.info("Fetched octanes.")
+    return fast_json(paginate(result, page, response), List[Octane], response)
 
 
 @router.put("/{id}", response_model=Octane)
@@ -53,9 +67,9 @@ async def update_octane(
     params: OctaneUpdate,
     db: AsyncSession = Depends(get_db_session),
 ) -> Octane:
-    logger.info(f"Updating octane with id: {id}.")
+    log.info("Updating octane with id: {}.", id)
     result = await octanes.update_octane(id, params, db)
-    logger.info(f"Updated octane: {result}.")
+    log.info("Updated octane: {}.", result)
     return result
 
 
@@ -64,7 +78,7 @@ async def update_octane(
 async def delete_octane(
     request: Request, id: int, db: AsyncSession = Depends(get_db_session)
 ) -> None:
-    logger.info(f"Deleting octane with id: {id}.")
+    log.info("Deleting octane with id: {}.", id)
     result = await octanes.delete_octane(id, db)
-    logger.info(f"Deleted octane: {result}.")
+    log.info("Deleted octane: {}.", result)
     return result
@@ -1,15 +1,36 @@
-from typing import List
+from typing import List, Literal, Optional, Tuple
 
-from fastapi import APIRouter, Depends, Request
-from loguru import logger
+from fastapi import APIRouter, Body, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from config.constants import MAX_BULK_SIZE
+from config.settings import settings
+from core import log
+from core.batch import parse_ids, report_missing
+from core.export import ENCODERS, MEDIA_TYPES
+from core.fields import SparseFields
 from core.limiter import limiter
+from core.pagination import Page, paginate
+from core.responses import fast_json, json_response, rows_response
+from core.timing import TimedRoute
 from crud import refills
-from database.session import get_db_session
-from schemas import Refill, RefillCreate, RefillUpdate
+from database.session import (
+    get_db_session,
+    get_db_session_factory,
+    get_read_session,
+)
+from schemas import (
+    Refill,
+    RefillBulkResult,
+    RefillCreate,
+    RefillFilter,
+    RefillUpdate,
+)
 
-router = APIRouter(prefix="/refills")
+router = APIRouter(prefix="/refills", route_class=TimedRoute)
+
+refill_fields = SparseFields(Refill)
 
 
 @router.post("/", response_model=Refill)
@@ -17,32 +38,104 @@ router = APIRouter(prefix="/refills")
 async def create_refill(
     request: Request, params: RefillCreate, db: AsyncSession = Depends(get_db_session)
 ) -> Refill:
-    logger.info(f"Creating refill: {params}.")
+    log.info("Creating refill: {}.", params)
     result = await refills.create_refill(params, db)
-    logger.info(f"Created refill: {result}.")
+    log.info("Created refill: {}.", result)
     return result
 
 
+@router.post("/bulk", response_model=RefillBulkResult)
+@limiter.limit("10/minute")
+async def create_refills(
+    request: Request,
+    params: List[RefillCreate] = Body(..., min_length=1, max_length=MAX_BULK_SIZE),
+    partial: bool = False,
+    db: AsyncSession = Depends(get_db_session),
+) -> RefillBulkResult:
+    log.info("Creating {} refills.", len(params))
+    result = await refills.create_refills(params, db, partial)
+    log.info(
+        "Created {} refills with {} errors.", len(result.created), len(result.errors)
+    )
+    return result
+
+
+@router.get("/export", response_class=StreamingResponse)
+@limiter.limit("10/minute")
+async def export_refills(
+    request: Request,
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    session_factory=Depends(get_db_session_factory),
+) -> StreamingResponse:
+    log.info("Exporting refills as {}.", format)
+
+    async def content():
+        async with session_factory() as session:
+            batches = refills.stream_refills(session)
+            async for chunk in ENCODERS[format](batches, refills.EXPORT_COLUMNS):
+                yield chunk
+        log.info("Exported refills as {}.", format)
+
+    return StreamingResponse(
+        content(),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="refills.{format}"'},
+    )
+
+
 @router.get("/{id}", response_model=Refill)
 @limiter.limit("60/minute")
 async def read_refill(
-    request: Request, id: int, db: AsyncSession = Depends(get_db_session)
+    request: Request,
+    response: Response,
+    id: int,
+    fields: Optional[Tuple[str, ...]] = Depends(refill_fields),
+    db: AsyncSession = Depends(get_read_session),
 ) -> Refill:
-    logger.info(f"Fetching refill with id: {id}.")
-    result = await refills.read_refill(id, db)
-    logger.info(f"Fethced refill: {result}.")
+    log.info("Fetching refill with id: {}.", id)
+    result = await refills.read_refill(id, db, fields)
+    log.info("Fetched refill: {}.", result)
+    if fields is not None:
+        return json_response(result, response)
     return result
 
 
 @router.get("/", response_model=List[Refill])
 @limiter.limit("60/minute")
 async def read_refills(
-    request: Request, db: AsyncSession = Depends(get_db_session)
+    request: Request,
+    response: Response,
+    page: Page = Depends(),
+    filters: RefillFilter = Depends(),
+    fields: Optional[Tuple[str, ...]] = Depends(refill_fields),
+    ids: Optional[List[int]] = Depends(parse_ids),
+    db: AsyncSession = Depends(get_read_session),
 ) -> List[Refill]:
-    logger.info("Fetching refills.")
-    result = await refills.read_refills(db)
-    logger.info("Fetched refills.")
-    return result
+    if ids is not None:
+        log.info("Fetching refills with ids: {}.", ids)
+        result = await refills.read_refills_by_ids(ids, db, fields)
+        log.info("Fetched {} of {} refills.", len(result), len(ids))
+        report_missing(ids, result, response)
+        if fields is not None:
+            return json_response(result, response)
+        return fast_json(result, List[Refill], response)
+
+    log.info("Fetching refills: {}.", filters)
+    after = page.after if filters.sort.lstrip("-") == "id" else page.cursor
+    key = refills.refill_sort_key(filters)
+    if fields is None and not settings.fast_json:
+        result = await refills.read_refills(db, after, page.limit + 1, filters)
+        log.info("Fetched refills.")
+        return paginate(result, page, response, key=key)
+
+    # The cursor is built from the rows, which hold the sort column even when it
+    # was not requested, before they are cut down to the requested fields
+    rows = await refills.read_refill_rows(db, after, page.limit + 1, filters, fields)
+    log.info("Fetched refills.")
+    rows = paginate(rows, page, response, key=key)
+    if settings.fast_json:
+        return rows_response(rows, Refill, response, fields)
+    return json_response(refills.sparse_refills(rows, fields), response)
 
 
 @router.put("/{id}", response_model=Refill)
@@ -53,9 +146,9 @@ async def update_refill(
     params: RefillUpdate,
     db: AsyncSession = Depends(get_db_session),
 ) -> Refill:
-    logger.info(f"Updating refill with id: {id}.")
+    log.info("Updating refill with id: {}.", id)
     result = await refills.update_refill(id, params, db)
-    logger.info(f"Updated refill: {result}.")
+    log.info("Updated refill: {}.", result)
     return result
 
 
@@ -64,7 +157,7 @@ async def update_refill(
 async def delete_refill(
     request: Request, id: int, db: AsyncSession = Depends(get_db_session)
 ) -> Refill:
-    logger.info(f"Deleting refill with id: {id}.")
+    log.info("Deleting refill with id: {}.", id)
     result = await refills.delete_refill(id, db)
-    logger.info(f"Deleted refill: {result}.")
+    log.info("Deleted refill: {}.", result)
     return result
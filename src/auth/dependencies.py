@@ -5,8 +5,9 @@ from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.models import User
-from auth.services import get_user_by_username
+from auth.services import get_cached_user
 from auth.utils import verify_token
+from core.timing import timed
 from database.session import get_db_session
 from exceptions.exceptions import InvalidAccountError, InvalidTokenError
 
@@ -19,7 +20,9 @@ async def get_current_user(
 ) -> User:
     """Fetch the user currently authenticated via an access token.
 
-    Returns a `User` Pydantic model containing the user's information.
+    Returns a `User` Pydantic model containing the user's information. Users are
+    cached by username for `user_cache_ttl` seconds, so a hot client only reaches
+    the users table once per TTL.
 
     Parameters
     ----------
@@ -39,11 +42,12 @@ async def get_current_user(
     InvalidTokenError
         If the token is invalid or expired, or if the username does not exist.
     """
-    token_data = verify_token(token)
-    db_user = await get_user_by_username(token_data.username, db)
-    if not db_user:
+    with timed("auth"):
+        token_data = verify_token(token)
+        user = await get_cached_user(token_data.username, db)
+    if not user:
         raise InvalidTokenError("Invalid credentials.")
-    return User.model_validate(db_user)
+    return user
 
 
 async def get_current_active_user(
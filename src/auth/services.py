@@ -1,3 +1,4 @@
+import time
 from datetime import timedelta
 from typing import Annotated
 from uuid import uuid4
@@ -5,17 +6,30 @@ from uuid import uuid4
 from fastapi import Depends
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import SecretStr
-from sqlalchemy import or_, select
+from sqlalchemy import or_, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.models import DBUser, RegisterUserRequest, Token, User
-from auth.utils import create_access_token, get_password_hash, verify_password
+from auth.utils import (
+    create_access_token,
+    get_password_hash_async,
+    verify_password_async,
+)
 from config.settings import settings
+from core.cache import get_cache
+from core.metrics import Histogram
+from database.invalidation import publish_invalidation
 from exceptions.exceptions import AuthenticationFailed, RegistrationFailed
 
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
+# Validated users keyed by username, the subject of their access tokens
+user_cache = get_cache("users", ttl=settings.user_cache_ttl)
+
+# Latency of logins, successful or not, mostly spent verifying the password
+login_latency = Histogram()
+
 
 async def register_user(
     register_user_request: RegisterUserRequest, session: AsyncSession
@@ -65,7 +79,7 @@ async def register_user(
         id=uuid4(),
         username=register_user_request.username,
         email=register_user_request.email,
-        hashed_password=get_password_hash(register_user_request.password),
+        hashed_password=await get_password_hash_async(register_user_request.password),
     )
     session.add(db_user)
     try:
@@ -102,6 +116,75 @@ async def get_user_by_username(username: str, session: AsyncSession) -> DBUser |
     return db_user
 
 
+async def get_cached_user(username: str, session: AsyncSession) -> User | None:
+    """Fetch a user by their username, serving repeated lookups from a TTL cache.
+
+    Returns a `User` Pydantic model if found; otherwise returns `None`. Only found
+    users are cached, so a user registered later is never hidden.
+
+    Parameters
+    ----------
+    username : str
+        The username of the user to fetch.
+
+    session : AsyncSession
+        The asynchronous session used to fetch the user on a cache miss.
+
+    Returns
+    -------
+    User | None
+        A Pydantic model representing the user if found, otherwise `None`.
+    """
+    user = user_cache.get(username)
+    if user is None:
+        # Taken before querying, so an account disabled meanwhile is not cached
+        generation = user_cache.generation
+        db_user = await get_user_by_username(username, session)
+        if not db_user:
+            return None
+        user = User.model_validate(db_user)
+        user_cache.set(username, user, generation)
+    return user
+
+
+async def set_user_active(
+    username: str, is_active: bool, session: AsyncSession
+) -> User | None:
+    """Enable or disable a user's account and evict them from every worker's cache.
+
+    Returns the updated `User` Pydantic model, or `None` if the username does not exist.
+
+    Parameters
+    ----------
+    username : str
+        The username of the user to update.
+
+    is_active : bool
+        Whether the account should be active.
+
+    session : AsyncSession
+        The asynchronous session used to update the user.
+
+    Returns
+    -------
+    User | None
+        A Pydantic model representing the updated user if found, otherwise `None`.
+    """
+    db_user = (
+        await session.execute(
+            update(DBUser)
+            .where(DBUser.username == username)
+            .values(is_active=is_active)
+            .returning(DBUser)
+        )
+    ).scalar_one_or_none()
+    if db_user:
+        await publish_invalidation(session, "users", username)
+    await session.commit()
+    user_cache.evict(username)
+    return User.model_validate(db_user) if db_user else None
+
+
 async def authenticate_user(
     username: str, password: SecretStr, session: AsyncSession
 ) -> User | None:
@@ -128,7 +211,7 @@ async def authenticate_user(
     db_user = await get_user_by_username(username, session)
     if not db_user:
         return None
-    if not verify_password(password, db_user.hashed_password):
+    if not await verify_password_async(password, db_user.hashed_password):
         return None
     return User.model_validate(db_user)
 
@@ -158,9 +241,13 @@ async def login_for_access_token(
     AuthenticationFailed
         If the username or password is invalid.
     """
-    user = await authenticate_user(
-        form_data.username, SecretStr(form_data.password), session
-    )
+    start = time.perf_counter()
+    try:
+        user = await authenticate_user(
+            form_data.username, SecretStr(form_data.password), session
+        )
+    finally:
+        login_latency.observe(time.perf_counter() - start)
 
     if not user:
         raise AuthenticationFailed("Invalid username or password.")
@@ -7,11 +7,17 @@ from pydantic import SecretStr
 
 from auth.models import TokenData
 from config.settings import settings
+from core.executor import BoundedExecutor
 from exceptions.exceptions import InvalidTokenError
 
 SECRET_KEY = settings.secret_key
 ALGORITHM = settings.algorithm
 
+# bcrypt is deliberately slow, so it runs off the event loop on a few threads
+password_executor = BoundedExecutor(
+    "bcrypt", settings.password_hash_workers, settings.password_hash_max_pending
+)
+
 
 def get_password_hash(password: SecretStr) -> str:
     """Generate a bcrpyt hash from a password.
@@ -57,6 +63,34 @@ def verify_password(plain_password: SecretStr, hashed_password: str) -> bool:
         return False
 
 
+async def get_password_hash_async(password: SecretStr) -> str:
+    """Generate a bcrypt hash from a password without blocking the event loop.
+
+    See `get_password_hash`. Runs on the bounded password executor.
+
+    Raises
+    ------
+    ServiceUnavailableError
+        If too many hashes and verifications are already in progress.
+    """
+    return await password_executor.run(get_password_hash, password)
+
+
+async def verify_password_async(
+    plain_password: SecretStr, hashed_password: str
+) -> bool:
+    """Verify a password against a bcrypt hash without blocking the event loop.
+
+    See `verify_password`. Runs on the bounded password executor.
+
+    Raises
+    ------
+    ServiceUnavailableError
+        If too many hashes and verifications are already in progress.
+    """
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
 def create_access_token(
     data: dict,
     expires_delta: timedelta | None = None,
@@ -1,2 +1,10 @@
 API_PREFIX = "/api"
 VERSION = "0.1.0"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+EXPORT_BATCH_SIZE = 1000
+MAX_BULK_SIZE = 5000
+MAX_BATCH_IDS = 1000
+
+# Bump together with a new step in database.tables.MIGRATIONS
+SCHEMA_VERSION = 4
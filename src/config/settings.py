@@ -1,3 +1,5 @@
+from typing import List, Literal, Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -16,6 +18,30 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int = 30
     max_connections_count: int = 20
     min_connections_count: int = 1
+    db_pool_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_replica_urls: List[SecretStr] = []
+    db_replica_check_interval: float = 5.0
+    db_replica_max_lag: float = 5.0
+    refills_fill_date_index: Literal["btree", "brin"] = "btree"
+    cache_ttl: float = 300.0
+    cache_maxsize: int = 1024
+    user_cache_ttl: float = 60.0
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 32
+    fast_json: bool = False
+    rate_limit_enabled: bool = True
+    rate_limit_storage: Literal["memory", "postgres"] = "memory"
+    rate_limit_max_keys: int = 100_000
+    log_json: bool = False
+    log_enqueue: bool = True
+    log_sample_rate: float = 1.0
+    server_timing: bool = True
+    metrics_enabled: bool = True
+    metrics_dir: Optional[str] = None
+    metrics_flush_interval: float = 5.0
     debug: bool = False
 
     @property
@@ -0,0 +1,57 @@
+from typing import Any, List, Optional, Sequence, TypeVar
+
+from fastapi import Query, Response
+
+from config.constants import MAX_BATCH_IDS
+from exceptions.exceptions import InvalidParameterError
+
+MISSING_IDS_HEADER = "X-Missing-Ids"
+# Ids are Postgres `integer`s, larger values cannot even be bound
+MAX_ID = 2**31 - 1
+
+T = TypeVar("T")
+
+
+def is_id(value: Any) -> bool:
+    """Whether `value` is an int that fits an id column."""
+    return type(value) is int and -MAX_ID - 1 <= value <= MAX_ID
+
+
+def parse_ids(
+    ids: Optional[str] = Query(
+        None,
+        description="Comma-separated ids to fetch at once, instead of a page.",
+    ),
+) -> Optional[List[int]]:
+    """Parse `ids=1,2,3` into sorted, distinct ids, or `None` when not given.
+
+    Raises
+    ------
+    InvalidParameterError
+        If an id is not a 32-bit integer, or more than `MAX_BATCH_IDS` are
+        requested.
+    """
+    if ids is None:
+        return None
+    try:
+        parsed = sorted({int(id) for id in ids.split(",") if id.strip()})
+    except ValueError:
+        raise InvalidParameterError("Ids must be comma-separated integers.")
+    if parsed and not -MAX_ID - 1 <= parsed[0] <= parsed[-1] <= MAX_ID:
+        raise InvalidParameterError("Ids must be 32-bit integers.")
+    if not parsed:
+        raise InvalidParameterError("No ids requested.")
+    if len(parsed) > MAX_BATCH_IDS:
+        raise InvalidParameterError(
+            f"At most {MAX_BATCH_IDS} ids can be requested at once."
+        )
+    return parsed
+
+
+def report_missing(ids: Sequence[int], items: List[T], response: Response) -> List[T]:
+    """List the requested ids that were not found in the `X-Missing-Ids` header."""
+    found = {item.id for item in items}
+    missing = [id for id in ids if id not in found]
+    if missing:
+        response.headers[MISSING_IDS_HEADER] = ",".join(map(str, missing))
+    return items
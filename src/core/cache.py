@@ -0,0 +1,105 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from config.settings import settings
+
+_MISSING = object()
+
+# Key for entries derived from a whole collection, e.g. every row of a table
+ALL = "all"
+
+
+class TTLCache:
+    """A size-bounded in-process cache whose entries expire after `ttl` seconds.
+
+    When full, the least recently used entry is evicted. Hits and misses are
+    counted so the cache's effectiveness can be observed.
+
+    `generation` goes up whenever entries are dropped. A reader that missed
+    takes it before querying and passes it back to `set`, so a value read
+    before a write is not cached after the write evicted it.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, Tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._entries.get(key, _MISSING)
+        if entry is not _MISSING:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        """Cache `value`, unless entries were dropped since `generation`."""
+        if generation is not None and generation != self.generation:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def evict(self, key: Optional[Hashable] = None) -> None:
+        """Drop `key` along with the `ALL` entry built from it, or everything."""
+        if key is None:
+            self.clear()
+        else:
+            self.invalidate(key)
+            self.invalidate(ALL)
+
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self), "hits": self.hits, "misses": self.misses}
+
+
+caches: Dict[str, TTLCache] = {}
+
+
+def get_cache(
+    name: str, maxsize: Optional[int] = None, ttl: Optional[float] = None
+) -> TTLCache:
+    """Return the process-wide cache registered under `name`, creating it if needed.
+
+    Size and TTL default to the `cache_maxsize` and `cache_ttl` settings.
+    """
+    if name not in caches:
+        caches[name] = TTLCache(
+            name,
+            maxsize if maxsize is not None else settings.cache_maxsize,
+            ttl if ttl is not None else settings.cache_ttl,
+        )
+    return caches[name]
+
+
+def clear_caches() -> None:
+    for cache in caches.values():
+        cache.clear()
+
+
+def evict(name: str, key: Optional[Hashable] = None) -> None:
+    """Evict `key` from the cache registered under `name`, if there is one."""
+    cache = caches.get(name)
+    if cache is not None:
+        cache.evict(key)
@@ -0,0 +1,127 @@
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass
+from random import random
+from typing import Any, Dict, Optional, Tuple
+
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.metrics import Histogram
+
+REQUEST_ID_HEADER = "X-Request-Id"
+# Ids sent by clients are kept if they are short and safe to log
+REQUEST_ID_PATTERN = re.compile(r"^[\w.:-]{1,128}$")
+
+
+@dataclass
+class RequestContext:
+    """The request being served, with the time its queries took so far."""
+
+    id: str
+    sampled: bool = True
+    db_time: float = 0.0
+    db_queries: int = 0
+    # Set by `core.timing.ServerTimingMiddleware` when it is on
+    timings: Optional[Dict[str, float]] = None
+    handler_end: Optional[float] = None
+
+
+# Latency of the requests served, per (route, status)
+request_latency: Dict[Tuple[str, int], Histogram] = {}
+
+request_context: ContextVar[Optional[RequestContext]] = ContextVar(
+    "request_context", default=None
+)
+
+
+def route_path(scope: Scope) -> Optional[str]:
+    """Return the template of the route serving `scope`, once routed.
+
+    It is the path as declared on the route's router, without the prefixes the
+    router was included with, so that ids in paths do not split routes.
+    """
+    return getattr(scope.get("route"), "path", None)
+
+
+def _request_id(scope: Scope) -> str:
+    header = REQUEST_ID_HEADER.lower().encode()
+    for name, value in scope["headers"]:
+        if name == header:
+            request_id = value.decode("latin-1")
+            if REQUEST_ID_PATTERN.match(request_id):
+                return request_id
+            break
+    return uuid.uuid4().hex
+
+
+class RequestContextMiddleware:
+    """Give every request an id, and log its route, status, latency and DB time.
+
+    The id comes from the client's `X-Request-Id` header or is generated, is
+    returned in that header and tagged on every log line of the request. Only
+    `sample_rate` of requests are picked for the INFO lines, see
+    `core.log.setup_logging`.
+    """
+
+    def __init__(self, app: ASGIApp, sample_rate: float = 1.0):
+        self.app = app
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        context = RequestContext(_request_id(scope), random() < self.sample_rate)
+        header = (REQUEST_ID_HEADER.lower().encode(), context.id.encode())
+        status_code = 500
+
+        async def send_with_id(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        token = request_context.set(context)
+        start = time.perf_counter()
+        try:
+            with logger.contextualize(request_id=context.id):
+                try:
+                    await self.app(scope, receive, send_with_id)
+                finally:
+                    latency = time.perf_counter() - start
+                    route = route_path(scope)
+                    # Unrouted requests share a label, as their paths are unbounded
+                    key = (route or "unmatched", status_code)
+                    if key not in request_latency:
+                        request_latency[key] = Histogram()
+                    request_latency[key].observe(latency)
+                    # Checked before building the line, which `core.log.is_sampled`
+                    # could only drop once formatted
+                    if context.sampled:
+                        route = route or scope["path"]
+                        fields: Dict[str, Any] = {
+                            "route": route,
+                            "status": status_code,
+                            "latency_ms": round(latency * 1000, 2),
+                            "db_ms": round(context.db_time * 1000, 2),
+                            "db_queries": context.db_queries,
+                        }
+                        if context.timings is not None:
+                            fields["timings_ms"] = {
+                                phase: round(elapsed * 1000, 2)
+                                for phase, elapsed in context.timings.items()
+                            }
+                        logger.bind(**fields).info(
+                            "{} {} {} in {:.1f}ms.",
+                            scope["method"],
+                            route,
+                            status_code,
+                            latency * 1000,
+                        )
+        finally:
+            request_context.reset(token)
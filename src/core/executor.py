@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from core.metrics import Histogram
+from exceptions.exceptions import ServiceUnavailableError
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """A thread pool for blocking work that sheds load instead of queueing forever.
+
+    At most `max_workers` jobs run at once and `max_pending` more wait for a
+    thread. Beyond that, `run` fails fast with `ServiceUnavailableError`.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_pending: int):
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix=name)
+        # Released from the worker thread once a job finishes, even if the
+        # awaiting request was cancelled, so slots track real thread usage
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        # From submission to result, waiting for a thread included
+        self.latency = Histogram()
+        self.rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ServiceUnavailableError(
+                "Server is busy. Please try again later.", self.name
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        start = time.perf_counter()
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            self.latency.observe(time.perf_counter() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rejected": self.rejected, "latency": self.latency.snapshot()}
+
+    def shutdown(self) -> None:
+        """Cancel the jobs still waiting for a thread and let the threads exit."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
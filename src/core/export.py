@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+from datetime import date
+from decimal import Decimal
+from typing import Any, AsyncIterator, Dict, Sequence
+
+from sqlalchemy import Row
+
+MEDIA_TYPES: Dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, date):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+async def to_ndjson(
+    batches: AsyncIterator[Sequence[Row]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as newline-delimited JSON, one chunk per batch."""
+    async for rows in batches:
+        lines = (
+            json.dumps(row._asdict(), default=_to_json_value, separators=(",", ":"))
+            for row in rows
+        )
+        yield ("\n".join(lines) + "\n").encode()
+
+
+async def to_csv(
+    batches: AsyncIterator[Sequence[Row]], columns: Sequence[str]
+) -> AsyncIterator[bytes]:
+    """Encode batches of rows as CSV, one chunk per batch after a header chunk.
+
+    The header names `columns`, so that an export without rows still has one.
+    """
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(columns)
+    yield buffer.getvalue().encode()
+    async for rows in batches:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        yield buffer.getvalue().encode()
+
+
+ENCODERS = {"ndjson": to_ndjson, "csv": to_csv}
@@ -0,0 +1,55 @@
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple, Type
+
+from fastapi import Query
+from pydantic import BaseModel, create_model
+
+from exceptions.exceptions import InvalidParameterError
+
+
+class SparseFields:
+    """Parse `fields=a,b,c` into the requested subset of a schema's fields.
+
+    Injected via `Depends(SparseFields(Schema))`. Yields `None` when the parameter
+    is absent, else the field names in schema order, always including `always`.
+    """
+
+    def __init__(self, model: Type[BaseModel], always: Sequence[str] = ("id",)):
+        self.model = model
+        self.always = tuple(always)
+
+    def __call__(
+        self,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return, e.g. `id,cost`."
+        ),
+    ) -> Optional[Tuple[str, ...]]:
+        if fields is None:
+            return None
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        if not requested:
+            raise InvalidParameterError("No fields requested.")
+        unknown = requested - self.model.model_fields.keys()
+        if unknown:
+            names = ", ".join(sorted(unknown))
+            raise InvalidParameterError(f"Unknown fields: {names}.")
+        return select_fields(self.model, requested.union(self.always))
+
+
+def select_fields(model: Type[BaseModel], fields: Sequence[str]) -> Tuple[str, ...]:
+    """Order `fields` as they are declared on `model`."""
+    return tuple(name for name in model.model_fields if name in fields)
+
+
+@lru_cache(maxsize=256)
+def sparse_model(model: Type[BaseModel], fields: Tuple[str, ...]) -> Type[BaseModel]:
+    """Build, once per field set, a copy of `model` with only `fields`."""
+    return create_model(
+        f"{model.__name__}[{','.join(fields)}]",
+        __config__=model.model_config,
+        **{
+            name: (info.annotation, info)
+            for name, info in model.model_fields.items()
+            if name in fields
+        },
+    )
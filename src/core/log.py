@@ -1,8 +1,14 @@
+import json
 import logging
 import sys
+from typing import Any, Dict
 
 from loguru import logger
 
+from core.context import request_context
+
+INFO = logger.level("INFO").no
+
 
 class InterceptHandler(logging.Handler):
     def emit(self, record: logging.LogRecord) -> None:
@@ -10,10 +16,67 @@ class InterceptHandler(logging.Handler):
         logger_opt.log(record.levelname, record.getMessage())
 
 
-def setup_logging(debug: bool) -> None:
+def json_sink(message) -> None:
+    """Write a record as one JSON object, with its bound fields at the top level."""
+    record = message.record
+    entry: Dict[str, Any] = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "message": record["message"],
+        **record["extra"],
+    }
+    if record["exception"] is not None:
+        # Formatted by loguru before queueing, as tracebacks cannot be pickled
+        entry["exception"] = str(message)[len(record["message"]) :].strip()
+    sys.stderr.write(json.dumps(entry, default=str) + "\n")
+
+
+def info(message: str, *args: Any, **kwargs: Any) -> None:
+    """Log `message` at INFO, unless the current request was not sampled.
+
+    The check comes before loguru formats the message, so unsampled requests skip
+    the formatting. Log request INFO lines through this rather than `logger.info`.
+    """
+    context = request_context.get()
+    if context is None or context.sampled:
+        logger.opt(depth=1).info(message, *args, **kwargs)
+
+
+def is_sampled(record: Dict[str, Any]) -> bool:
+    """Drop INFO lines of requests not picked by `RequestContextMiddleware`.
+
+    Only a backstop for lines logged with `logger.info`, e.g. by libraries, as
+    sink filters run once the message is formatted.
+    """
+    if record["level"].no != INFO:
+        return True
+    context = request_context.get()
+    return context is None or context.sampled
+
+
+def setup_logging(
+    debug: bool,
+    serialize: bool = False,
+    enqueue: bool = False,
+    sample_rate: float = 1.0,
+) -> None:
+    """Route standard logging through loguru and configure its one sink.
+
+    With `enqueue`, records are written by a background thread so requests never
+    wait on stderr. With `serialize`, they are written as JSON lines carrying
+    the request id, and on access lines the route, latency and DB time.
+    """
     log_level = logging.DEBUG if debug else logging.INFO
 
     logging.basicConfig(
         handlers=[InterceptHandler(level=log_level)], level=log_level, force=True
     )
-    logger.configure(handlers=[{"sink": sys.stderr, "level": log_level}])
+    handler: Dict[str, Any] = {"sink": sys.stderr, "level": log_level}
+    if serialize:
+        handler.update(sink=json_sink, format="{message}", colorize=False)
+    if enqueue:
+        handler["enqueue"] = True
+    if sample_rate < 1:
+        handler["filter"] = is_sampled
+    logger.configure(handlers=[handler])
@@ -0,0 +1,199 @@
+import fcntl
+import json
+import math
+import os
+from bisect import bisect_left
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+# Sums of the counters and histograms of workers that have exited
+ARCHIVE_FILE = "archive.json"
+
+# Upper bounds in seconds, suited to latencies from a millisecond to a timeout
+DEFAULT_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+
+
+class Histogram:
+    """Counts observations into fixed buckets, keeping their sum and count."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        # The extra slot counts observations above the largest bound
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return cumulative bucket counts keyed by upper bound, as Prometheus does."""
+        cumulative, total = {}, 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            cumulative[bound] = total
+        cumulative[float("inf")] = self.count
+        return {"buckets": cumulative, "sum": self.sum, "count": self.count}
+
+
+def format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def format_labels(labels: Dict[str, Any]) -> str:
+    if not labels:
+        return ""
+    pairs = []
+    for name, value in labels.items():
+        # Bounds keep their decimal point, as in other Prometheus clients
+        text = repr(value) if isinstance(value, float) else str(value)
+        text = "+Inf" if text == "inf" else text
+        text = text.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        pairs.append(f'{name}="{text}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+@dataclass
+class Family:
+    """A Prometheus metric family, its samples keyed by name and labels."""
+
+    name: str
+    type: str
+    help: str
+    samples: Dict[str, float] = field(default_factory=dict)
+
+    def add(self, value: float, suffix: str = "", **labels: Any) -> None:
+        key = f"{self.name}{suffix}{format_labels(labels)}"
+        self.samples[key] = self.samples.get(key, 0) + value
+
+    def add_histogram(self, snapshot: Dict[str, Any], **labels: Any) -> None:
+        """Add a `Histogram.snapshot()` as bucket, sum and count samples."""
+        for bound, count in snapshot["buckets"].items():
+            self.add(count, "_bucket", **labels, le=float(bound))
+        self.add(snapshot["sum"], "_sum", **labels)
+        self.add(snapshot["count"], "_count", **labels)
+
+
+def render(families: Iterable[Family]) -> str:
+    """Render families in the Prometheus text exposition format."""
+    lines = []
+    for family in families:
+        lines.append(f"# HELP {family.name} {family.help}")
+        lines.append(f"# TYPE {family.name} {family.type}")
+        lines.extend(
+            f"{key} {format_value(value)}" for key, value in family.samples.items()
+        )
+    return "\n".join(lines) + "\n"
+
+
+def merge(snapshots: Iterable[List[Family]]) -> List[Family]:
+    """Sum the samples of families collected by several processes."""
+    merged: Dict[str, Family] = {}
+    for families in snapshots:
+        for family in families:
+            target = merged.setdefault(
+                family.name, Family(family.name, family.type, family.help)
+            )
+            for key, value in family.samples.items():
+                target.samples[key] = target.samples.get(key, 0) + value
+    return list(merged.values())
+
+
+def _is_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsDirectory:
+    """Metrics of the workers of one host, as a file per worker in a shared directory.
+
+    Each worker writes its own snapshot, named after its pid, and any worker
+    answering a scrape sums them all. Once a worker has exited, its counters
+    and histograms are folded into an archive, so that the sums never go back
+    as workers restart, and its gauges are dropped.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.file = self.path / f"{os.getpid()}.json"
+        self.archive = self.path / ARCHIVE_FILE
+
+    def write(self, families: List[Family]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._write(self.file, families)
+
+    def read(self) -> List[List[Family]]:
+        self.path.mkdir(parents=True, exist_ok=True)
+        snapshots = []
+        with self._lock():
+            for path in self.path.glob("*.json"):
+                if path == self.archive:
+                    continue
+                if not path.stem.isdigit() or _is_running(int(path.stem)):
+                    snapshots.append(self._read(path))
+                else:
+                    self._fold(path)
+            snapshots.append(self._read(self.archive))
+        return snapshots
+
+    def remove(self) -> None:
+        """Archive this worker's snapshot, e.g. as it shuts down."""
+        if self.file.exists():
+            with self._lock():
+                self._fold(self.file)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        # Folding a file twice would count it twice
+        with open(self.path / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _fold(self, path: Path) -> None:
+        kept = [family for family in self._read(path) if family.type != "gauge"]
+        self._write(self.archive, merge([self._read(self.archive), kept]))
+        path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _read(path: Path) -> List[Family]:
+        try:
+            return [Family(**family) for family in json.loads(path.read_text())]
+        except (OSError, ValueError):
+            return []
+
+    @staticmethod
+    def _write(path: Path, families: List[Family]) -> None:
+        # Written aside then renamed, so that readers never see half a file
+        partial = path.with_suffix(".tmp")
+        partial.write_text(json.dumps([family.__dict__ for family in families]))
+        os.replace(partial, path)
@@ -0,0 +1,83 @@
+import base64
+import json
+from typing import Any, Callable, List, Optional, Sequence, Tuple, TypeVar
+
+from fastapi import Query, Response
+
+from config.constants import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from core.batch import is_id
+from exceptions.exceptions import InvalidParameterError
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+T = TypeVar("T")
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode the keyset values of the last item on a page into an opaque cursor."""
+    payload = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[Any, ...]]:
+    """Decode a cursor produced by `encode_cursor` back into its keyset values.
+
+    Raises
+    ------
+    InvalidParameterError
+        If the cursor is malformed.
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise InvalidParameterError("Invalid pagination cursor.")
+    if not isinstance(values, list) or not values:
+        raise InvalidParameterError("Invalid pagination cursor.")
+    return tuple(values)
+
+
+class Page:
+    """Keyset pagination parameters shared by the list endpoints.
+
+    Injected via `Depends()`. Items are returned in ascending key order, starting
+    right after the item the `after` cursor points to.
+    """
+
+    def __init__(
+        self,
+        after: Optional[str] = Query(
+            None, description="Cursor returned in the previous page's header."
+        ),
+        limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    ):
+        self.cursor = decode_cursor(after)
+        self.limit = limit
+
+    @property
+    def after(self) -> Optional[int]:
+        """The id of the last item on the previous page, if any."""
+        if self.cursor is None:
+            return None
+        if len(self.cursor) != 1 or not is_id(self.cursor[0]):
+            raise InvalidParameterError("Invalid pagination cursor.")
+        return self.cursor[0]
+
+
+def paginate(
+    items: List[T],
+    page: Page,
+    response: Response,
+    key: Callable[[T], Sequence[Any]] = lambda item: (item.id,),
+) -> List[T]:
+    """Trim a page fetched with `page.limit + 1` items and set the next-page cursor.
+
+    The extra item only signals that another page exists; it is dropped, and the
+    cursor of the last returned item is sent in the `X-Next-Cursor` header.
+    """
+    if len(items) > page.limit:
+        items = items[: page.limit]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*key(items[-1]))
+    return items
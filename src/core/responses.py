@@ -0,0 +1,74 @@
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Type
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import Row
+from typing_extensions import TypedDict
+
+from config.settings import settings
+
+JSON_MEDIA_TYPE = "application/json"
+
+
+@lru_cache(maxsize=256)
+def get_adapter(schema: Any) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+@lru_cache(maxsize=256)
+def get_row_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    """A serializer for lists of dicts holding any subset of `model`'s fields."""
+    fields = {name: info.annotation for name, info in model.model_fields.items()}
+    return TypeAdapter(List[TypedDict(f"{model.__name__}Row", fields, total=False)])
+
+
+def json_response(
+    content: Any, response: Response, schema: Optional[Any] = None
+) -> Response:
+    """Serialize already validated schemas straight to JSON bytes.
+
+    Returning `content` from a route instead would have FastAPI validate it
+    against the response model again first. Given `schema`, its serializer is
+    used, else the one of each value is looked up. Headers already set on the
+    injected `response`, such as the pagination cursor, are carried over.
+    """
+    if schema is None:
+        body = to_json(content)
+    else:
+        body = get_adapter(schema).dump_json(content)
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=dict(response.headers))
+
+
+def rows_response(
+    rows: Sequence[Row],
+    model: Type[BaseModel],
+    response: Response,
+    fields: Optional[Sequence[str]] = None,
+) -> Response:
+    """Serialize database rows as a list of `model` without building one per row.
+
+    Values are not validated, so the columns must hold the types `model`
+    declares, and be selected in its order, which the output keeps. Given
+    `fields`, only those columns are returned.
+    """
+    columns = rows[0]._fields if rows else ()
+    if fields is None or set(columns) <= set(fields):
+        items = [dict(zip(columns, row)) for row in rows]
+    else:
+        keys = [(name, index) for index, name in enumerate(columns) if name in fields]
+        items = [{name: row[index] for name, index in keys} for row in rows]
+    body = get_row_adapter(model).dump_json(items)
+    return Response(body, media_type=JSON_MEDIA_TYPE, headers=dict(response.headers))
+
+
+def fast_json(content: Any, schema: Any, response: Response) -> Any:
+    """Return `content` pre-serialized when `settings.fast_json` is on.
+
+    Otherwise it is returned as is, for FastAPI to check against the route's
+    response model.
+    """
+    if settings.fast_json:
+        return json_response(content, response, schema)
+    return content
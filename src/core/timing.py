@@ -0,0 +1,127 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Tuple
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.context import request_context, route_path
+from core.metrics import Histogram
+
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Seconds spent in each phase, per (route, phase)
+phase_latency: Dict[Tuple[str, str], Histogram] = {}
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to `phase` of the current request.
+
+    Does nothing outside a request, or when `ServerTimingMiddleware` is off.
+    """
+    context = request_context.get()
+    if context is None or context.timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        context.timings[phase] = context.timings.get(phase, 0.0) + elapsed
+
+
+def _timed_endpoint(func: Callable[..., Any]) -> Callable[..., Any]:
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        context = request_context.get()
+        if context is None or context.timings is None:
+            return await func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            context.handler_end = time.perf_counter()
+            context.timings["handler"] = context.handler_end - start
+
+    return wrapper
+
+
+class TimedRoute(APIRoute):
+    """A route timing its endpoint as the `handler` phase.
+
+    Whatever FastAPI does between the endpoint returning and the response
+    starting, checking the result against the response model and serializing
+    it, is then timed as `serialize`.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = _timed_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    return ", ".join(
+        f"{phase};dur={elapsed * 1000:.2f}" for phase, elapsed in timings.items()
+    )
+
+
+class ServerTimingMiddleware:
+    """Time the phases of every request and return them as a `Server-Timing` header.
+
+    Phases are `auth`, `db`, `validate`, `handler`, `serialize` and `total`, in
+    milliseconds. They nest rather than add up: `handler` includes the `db` and
+    `validate` time of the endpoint, and `auth` its own query. Durations are
+    also kept per route in `phase_latency`. Must run inside
+    `RequestContextMiddleware`.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        context = request_context.get()
+        if scope["type"] != "http" or context is None:
+            await self.app(scope, receive, send)
+            return
+
+        context.timings = timings = {}
+        start = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                now = time.perf_counter()
+                if context.handler_end is not None:
+                    timings["serialize"] = now - context.handler_end
+                timings["db"] = context.db_time
+                timings["total"] = now - start
+                header = (
+                    SERVER_TIMING_HEADER.lower().encode(),
+                    format_server_timing(timings).encode(),
+                )
+                message["headers"] = [*message.get("headers", ()), header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = route_path(scope)
+            # Unrouted requests are left out, as their paths are unbounded
+            if route is not None:
+                for phase, elapsed in timings.items():
+                    key = (route, phase)
+                    if key not in phase_latency:
+                        phase_latency[key] = Histogram()
+                    phase_latency[key].observe(elapsed)
+
+
+def timing_stats() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """Return the histograms of each route's phases."""
+    stats: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (route, phase), histogram in phase_latency.items():
+        stats.setdefault(route, {})[phase] = histogram.snapshot()
+    return stats
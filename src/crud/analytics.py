@@ -0,0 +1,140 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import ColumnElement, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+import models
+from core.batch import is_id
+from core.timing import timed
+from exceptions.exceptions import InvalidParameterError
+from schemas import RefillEconomy, RefillMonthlySummary
+
+
+def _after_condition(after: Any) -> ColumnElement:
+    refill = models.Refill
+    try:
+        odometer, id = after
+        if not is_id(id):
+            raise TypeError
+        odometer = Decimal(str(odometer))
+    except (TypeError, ValueError, ArithmeticError):
+        raise InvalidParameterError("Invalid pagination cursor.")
+    return tuple_(refill.odometer, refill.id) > tuple_(odometer, id)
+
+
+def economy_key(item: RefillEconomy) -> Tuple[float, int]:
+    """Return the keyset of an economy item, its refill's (odometer, id)."""
+    return (item.odometer, item.refill_id)
+
+
+async def read_economy(
+    session: AsyncSession,
+    after: Optional[Any] = None,
+    limit: Optional[int] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    brand_id: Optional[int] = None,
+    octane_id: Optional[int] = None,
+) -> List[RefillEconomy]:
+    # `after` is the (odometer, id) keyset of the previous page's last refill
+    refill = models.Refill
+    previous = aliased(models.Refill)
+    # The distance is measured from the refill just below in odometer order,
+    # filtered out or not, found by one probe of the (odometer, id) index per row
+    # rather than by a window over the whole table
+    previous_odometer = (
+        select(previous.odometer)
+        .where(
+            tuple_(previous.odometer, previous.id) < tuple_(refill.odometer, refill.id)
+        )
+        .order_by(previous.odometer.desc(), previous.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    series = select(
+        refill.id.label("refill_id"),
+        refill.fill_date,
+        refill.odometer,
+        refill.brand_id,
+        refill.octane_id,
+        refill.liters_filled,
+        refill.cost,
+        (refill.odometer - previous_odometer).label("distance"),
+    ).order_by(refill.odometer, refill.id)
+
+    if date_from is not None:
+        series = series.where(refill.fill_date >= date_from)
+    if date_to is not None:
+        series = series.where(refill.fill_date <= date_to)
+    if brand_id is not None:
+        series = series.where(refill.brand_id == brand_id)
+    if octane_id is not None:
+        series = series.where(refill.octane_id == octane_id)
+    if after is not None:
+        series = series.where(_after_condition(after))
+    if limit is not None:
+        series = series.limit(limit)
+    page = series.subquery("series")
+
+    distance = page.c.distance
+    liters = func.nullif(page.c.liters_filled, 0)
+    stmt = select(
+        page.c.refill_id,
+        page.c.fill_date,
+        page.c.odometer,
+        page.c.brand_id,
+        page.c.octane_id,
+        page.c.liters_filled,
+        page.c.cost,
+        distance,
+        func.round(distance / liters, 2).label("km_per_liter"),
+        func.round(page.c.cost / func.nullif(distance, 0), 4).label("cost_per_km"),
+        func.round(page.c.cost / liters, 2).label("price_per_liter"),
+    ).order_by(page.c.odometer, page.c.refill_id)
+
+    rows = (await session.execute(stmt)).all()
+    with timed("validate"):
+        return [RefillEconomy.model_validate(row) for row in rows]
+
+
+async def read_monthly(
+    session: AsyncSession,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    brand_id: Optional[int] = None,
+    octane_id: Optional[int] = None,
+) -> List[RefillMonthlySummary]:
+    rollup = models.RefillMonthly
+    stmt = (
+        select(
+            rollup.month,
+            rollup.brand_id,
+            rollup.octane_id,
+            rollup.refill_count,
+            rollup.liters_filled,
+            rollup.cost,
+            func.round(rollup.cost / func.nullif(rollup.liters_filled, 0), 2).label(
+                "price_per_liter"
+            ),
+        )
+        # Months whose refills were all moved or deleted leave empty rows behind
+        .where(rollup.refill_count > 0)
+        .order_by(rollup.month, rollup.brand_id, rollup.octane_id)
+    )
+
+    # Bounds are matched against whole months
+    if date_from is not None:
+        stmt = stmt.where(rollup.month >= date_from.replace(day=1))
+    if date_to is not None:
+        stmt = stmt.where(rollup.month <= date_to)
+    if brand_id is not None:
+        stmt = stmt.where(rollup.brand_id == brand_id)
+    if octane_id is not None:
+        stmt = stmt.where(rollup.octane_id == octane_id)
+
+    rows = (await session.execute(stmt)).all()
+    with timed("validate"):
+        return [RefillMonthlySummary.model_validate(row) for row in rows]
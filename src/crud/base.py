@@ -0,0 +1,86 @@
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar
+
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    Integer,
+    Row,
+    any_,
+    bindparam,
+    delete,
+    insert,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models import Base
+
+T = TypeVar("T")
+
+
+def _columns(model: Type[Base]):
+    return model.__table__.columns
+
+
+def id_in(model: Type[Base], ids: Sequence[int]) -> ColumnElement:
+    """`id = ANY(:ids)`, binding one array so the SQL is the same for any number."""
+    return model.id == any_(bindparam("ids", list(ids), type_=ARRAY(Integer)))
+
+
+async def find_by_ids(
+    model: Type[Base], ids: Sequence[int], session: AsyncSession
+) -> Sequence[Base]:
+    """Load the rows with the given ids, sorted by id, in a single query."""
+    stmt = select(model).where(id_in(model, ids)).order_by(model.id)
+    return (await session.scalars(stmt)).all()
+
+
+async def insert_returning(
+    model: Type[Base], values: Dict[str, Any], session: AsyncSession
+) -> Row:
+    """Insert one row and return it as written, in a single round-trip."""
+    stmt = insert(model).values(**values).returning(*_columns(model))
+    return (await session.execute(stmt)).one()
+
+
+async def insert_many_returning(
+    model: Type[Base], rows: List[Dict[str, Any]], session: AsyncSession
+) -> Sequence[Row]:
+    """Insert many rows with batched multi-row INSERTs, returned in input order."""
+    stmt = insert(model).returning(*_columns(model), sort_by_parameter_order=True)
+    return (await session.execute(stmt, rows)).all()
+
+
+async def update_returning(
+    model: Type[Base], id: int, values: Dict[str, Any], session: AsyncSession
+) -> Optional[Row]:
+    """Update one row by id and return it as written, or `None` if it does not exist."""
+    if not values:
+        stmt = select(*_columns(model)).where(model.id == id)
+    else:
+        stmt = (
+            update(model)
+            .where(model.id == id)
+            .values(**values)
+            .returning(*_columns(model))
+        )
+    return (await session.execute(stmt)).one_or_none()
+
+
+async def delete_returning(
+    model: Type[Base], id: int, session: AsyncSession
+) -> Optional[Row]:
+    """Delete one row by id and return it, or `None` if it did not exist."""
+    stmt = delete(model).where(model.id == id).returning(*_columns(model))
+    return (await session.execute(stmt)).one_or_none()
+
+
+def slice_page(
+    items: Sequence[T], after: Optional[int] = None, limit: Optional[int] = None
+) -> List[T]:
+    """Apply keyset pagination in memory to items sorted by id."""
+    start = 0 if after is None else bisect_right(items, after, key=lambda item: item.id)
+    stop = None if limit is None else start + limit
+    return list(items[start:stop])
@@ -1,23 +1,37 @@
-from typing import List
+from typing import List, Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from core.cache import ALL, get_cache
+from core.timing import timed
+from crud.base import (
+    delete_returning,
+    find_by_ids,
+    insert_returning,
+    slice_page,
+    update_returning,
+)
+from database.invalidation import publish_invalidation
 from exceptions.exceptions import EntityAlreadyExistsError, EntityDoesNotExistError
 from schemas import Brand, BrandCreate, BrandUpdate
 
+# Keyed by id, plus ALL for the full table
+cache = get_cache("brands")
+
 
 async def create_brand(params: BrandCreate, session: AsyncSession) -> Brand:
-    db_brand = models.Brand(**params.model_dump())
-    session.add(db_brand)
     try:
+        row = await insert_returning(models.Brand, params.model_dump(), session)
+        await publish_invalidation(session, "brands", row.id)
         await session.commit()
-        await session.refresh(db_brand)
+        cache.evict(row.id)
     except IntegrityError:
+        await session.rollback()
         raise EntityAlreadyExistsError("Brand already exists.")
-    return Brand.model_validate(db_brand)
+    return Brand.model_validate(row)
 
 
 async def find_brand(id: int, session: AsyncSession) -> models.Brand:
@@ -27,37 +41,74 @@ async def find_brand(id: int, session: AsyncSession) -> models.Brand:
     return db_brand
 
 
-async def find_brands(session: AsyncSession) -> List[models.Brand]:
+async def find_brands(
+    session: AsyncSession, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[models.Brand]:
     stmt = select(models.Brand).order_by(models.Brand.id)
+    if after is not None:
+        stmt = stmt.where(models.Brand.id > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
     db_brands = (await session.scalars(stmt)).all()
     return db_brands
 
 
 async def read_brand(id: int, session: AsyncSession) -> Brand:
-    db_brand = await find_brand(id, session)
-    return Brand.model_validate(db_brand)
-
-
-async def read_brands(session: AsyncSession) -> List[Brand]:
-    db_brands = await find_brands(session)
-    return [Brand.model_validate(db_brand) for db_brand in db_brands]
+    brand = cache.get(id)
+    if brand is None:
+        generation = cache.generation
+        brand = Brand.model_validate(await find_brand(id, session))
+        cache.set(id, brand, generation)
+    return brand
+
+
+async def read_brands(
+    session: AsyncSession, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[Brand]:
+    brands = cache.get(ALL)
+    if brands is None:
+        generation = cache.generation
+        db_brands = await find_brands(session)
+        with timed("validate"):
+            brands = [Brand.model_validate(db_brand) for db_brand in db_brands]
+        cache.set(ALL, brands, generation)
+    return slice_page(brands, after, limit)
+
+
+async def read_brands_by_ids(ids: Sequence[int], session: AsyncSession) -> List[Brand]:
+    # Cached brands are reused, the rest are fetched in a single query
+    found = {id: cache.get(id) for id in ids}
+    missing = [id for id, brand in found.items() if brand is None]
+    if missing:
+        generation = cache.generation
+        for db_brand in await find_by_ids(models.Brand, missing, session):
+            found[db_brand.id] = Brand.model_validate(db_brand)
+            cache.set(db_brand.id, found[db_brand.id], generation)
+    return [brand for brand in found.values() if brand is not None]
 
 
 async def update_brand(id: int, params: BrandUpdate, session: AsyncSession) -> Brand:
-    db_brand = await find_brand(id, session)
-    for attr, value in params.model_dump(exclude_unset=True).items():
-        setattr(db_brand, attr, value)
-    session.add(db_brand)
     try:
+        row = await update_returning(
+            models.Brand, id, params.model_dump(exclude_unset=True), session
+        )
+        if row:
+            await publish_invalidation(session, "brands", id)
         await session.commit()
-        await session.refresh(db_brand)
+        cache.evict(id)
     except IntegrityError:
+        await session.rollback()
         raise EntityAlreadyExistsError("Brand with this name already exists.")
-    return Brand.model_validate(db_brand)
+    if not row:
+        raise EntityDoesNotExistError(f"Brand with id {id} does not exist.")
+    return Brand.model_validate(row)
 
 
 async def delete_brand(id: int, session: AsyncSession) -> Brand:
-    db_brand = await find_brand(id, session)
-    await session.delete(db_brand)
+    row = await delete_returning(models.Brand, id, session)
+    if not row:
+        raise EntityDoesNotExistError(f"Brand with id {id} does not exist.")
+    await publish_invalidation(session, "brands", id)
     await session.commit()
-    return Brand.model_validate(db_brand)
+    cache.evict(id)
+    return Brand.model_validate(row)
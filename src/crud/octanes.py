@@ -1,23 +1,37 @@
-from typing import List
+from typing import List, Optional, Sequence
 
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from core.cache import ALL, get_cache
+from core.timing import timed
+from crud.base import (
+    delete_returning,
+    find_by_ids,
+    insert_returning,
+    slice_page,
+    update_returning,
+)
+from database.invalidation import publish_invalidation
 from exceptions.exceptions import EntityAlreadyExistsError, EntityDoesNotExistError
 from schemas import Octane, OctaneCreate, OctaneUpdate
 
+# Keyed by id, plus ALL for the full table
+cache = get_cache("octanes")
+
 
 async def create_octane(params: OctaneCreate, session: AsyncSession) -> Octane:
-    db_octane = models.Octane(**params.model_dump())
-    session.add(db_octane)
     try:
+        row = await insert_returning(models.Octane, params.model_dump(), session)
+        await publish_invalidation(session, "octanes", row.id)
         await session.commit()
-        await session.refresh(db_octane)
+        cache.evict(row.id)
     except IntegrityError:
+        await session.rollback()
         raise EntityAlreadyExistsError("Octane already exists.")
-    return Octane.model_validate(db_octane)
+    return Octane.model_validate(row)
 
 
 async def find_octane(id: int, session: AsyncSession) -> models.Octane:
@@ -27,37 +41,76 @@ async def find_octane(id: int, session: AsyncSession) -> models.Octane:
     return db_octane
 
 
-async def find_octanes(session: AsyncSession) -> List[models.Octane]:
+async def find_octanes(
+    session: AsyncSession, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[models.Octane]:
     stmt = select(models.Octane).order_by(models.Octane.id)
+    if after is not None:
+        stmt = stmt.where(models.Octane.id > after)
+    if limit is not None:
+        stmt = stmt.limit(limit)
     db_octanes = (await session.scalars(stmt)).all()
     return db_octanes
 
 
 async def read_octane(id: int, session: AsyncSession) -> Octane:
-    db_octane = await find_octane(id, session)
-    return Octane.model_validate(db_octane)
-
-
-async def read_octanes(session: AsyncSession) -> List[Octane]:
-    db_octanes = await find_octanes(session)
-    return [Octane.model_validate(db_octane) for db_octane in db_octanes]
+    octane = cache.get(id)
+    if octane is None:
+        generation = cache.generation
+        octane = Octane.model_validate(await find_octane(id, session))
+        cache.set(id, octane, generation)
+    return octane
+
+
+async def read_octanes(
+    session: AsyncSession, after: Optional[int] = None, limit: Optional[int] = None
+) -> List[Octane]:
+    octanes = cache.get(ALL)
+    if octanes is None:
+        generation = cache.generation
+        db_octanes = await find_octanes(session)
+        with timed("validate"):
+            octanes = [Octane.model_validate(db_octane) for db_octane in db_octanes]
+        cache.set(ALL, octanes, generation)
+    return slice_page(octanes, after, limit)
+
+
+async def read_octanes_by_ids(
+    ids: Sequence[int], session: AsyncSession
+) -> List[Octane]:
+    # Cached octanes are reused, the rest are fetched in a single query
+    found = {id: cache.get(id) for id in ids}
+    missing = [id for id, octane in found.items() if octane is None]
+    if missing:
+        generation = cache.generation
+        for db_octane in await find_by_ids(models.Octane, missing, session):
+            found[db_octane.id] = Octane.model_validate(db_octane)
+            cache.set(db_octane.id, found[db_octane.id], generation)
+    return [octane for octane in found.values() if octane is not None]
 
 
 async def update_octane(id: int, params: OctaneUpdate, session: AsyncSession) -> Octane:
-    db_octane = await find_octane(id, session)
-    for attr, value in params.model_dump(exclude_unset=True).items():
-        setattr(db_octane, attr, value)
-    session.add(db_octane)
     try:
+        row = await update_returning(
+            models.Octane, id, params.model_dump(exclude_unset=True), session
+        )
+        if row:
+            await publish_invalidation(session, "octanes", id)
         await session.commit()
-        await session.refresh(db_octane)
+        cache.evict(id)
     except IntegrityError:
+        await session.rollback()
         raise EntityAlreadyExistsError("Octane with this grade already exists.")
-    return Octane.model_validate(db_octane)
+    if not row:
+        raise EntityDoesNotExistError(f"Octane with id {id} does not exist.")
+    return Octane.model_validate(row)
 
 
 async def delete_octane(id: int, session: AsyncSession) -> Octane:
-    db_octane = await find_octane(id, session)
-    await session.delete(db_octane)
+    row = await delete_returning(models.Octane, id, session)
+    if not row:
+        raise EntityDoesNotExistError(f"Octane with id {id} does not exist.")
+    await publish_invalidation(session, "octanes", id)
     await session.commit()
-    return Octane.model_validate(db_octane)
+    cache.evict(id)
+    return Octane.model_validate(row)
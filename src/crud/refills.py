@@ -1,29 +1,123 @@
-from typing import List
+from datetime import date
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    and_,
+    or_,
+    select,
+    tuple_,
+    update,
+)
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from config.constants import EXPORT_BATCH_SIZE
+from core.batch import is_id
+from core.fields import select_fields, sparse_model
+from core.timing import timed
+from crud.base import (
+    delete_returning,
+    find_by_ids,
+    id_in,
+    insert_many_returning,
+    insert_returning,
+)
+from crud.rollups import apply_refill_deltas
 from exceptions.exceptions import (
     EntityDoesNotExistError,
+    InvalidParameterError,
     RelatedEntityDoesNotExistError,
 )
-from schemas import Refill, RefillCreate, RefillUpdate
+from schemas import (
+    Refill,
+    RefillBulkError,
+    RefillBulkResult,
+    RefillCreate,
+    RefillFilter,
+    RefillUpdate,
+)
+
+
+def _raise_related_entity_error(e: IntegrityError) -> None:
+    if "brand" in str(e.orig):
+        raise RelatedEntityDoesNotExistError("Brand with this id does not exist.")
+    elif "octane" in str(e.orig):
+        raise RelatedEntityDoesNotExistError("Octane with this id does not exist.")
+    raise e
 
 
 async def create_refill(params: RefillCreate, session: AsyncSession) -> Refill:
-    db_refill = models.Refill(**params.model_dump())
-    session.add(db_refill)
+    # Unset dates are left out so the column default applies
+    try:
+        row = await insert_returning(
+            models.Refill, params.model_dump(exclude_none=True), session
+        )
+        await apply_refill_deltas(session, added=[row])
+        await session.commit()
+    except IntegrityError as e:
+        await session.rollback()
+        _raise_related_entity_error(e)
+    return Refill.model_validate(row)
+
+
+async def _find_existing_ids(model, ids: set, session: AsyncSession) -> set:
+    stmt = select(model.id).where(model.id.in_(ids))
+    return set((await session.scalars(stmt)).all())
+
+
+async def create_refills(
+    params: List[RefillCreate], session: AsyncSession, partial: bool = False
+) -> RefillBulkResult:
+    # Unset dates are left out so the column default applies
+    rows = [item.model_dump(exclude_none=True) for item in params]
+    errors = []
+    if partial:
+        brand_ids = await _find_existing_ids(
+            models.Brand, {row["brand_id"] for row in rows}, session
+        )
+        octane_ids = await _find_existing_ids(
+            models.Octane, {row["octane_id"] for row in rows}, session
+        )
+        valid_rows = []
+        for index, row in enumerate(rows):
+            if row["brand_id"] not in brand_ids:
+                detail = f"Brand with id {row['brand_id']} does not exist."
+            elif row["octane_id"] not in octane_ids:
+                detail = f"Octane with id {row['octane_id']} does not exist."
+            else:
+                valid_rows.append(row)
+                continue
+            errors.append(RefillBulkError(index=index, detail=detail))
+        rows = valid_rows
+
+    if not rows:
+        return RefillBulkResult(created=[], errors=errors)
+
     try:
+        created = await insert_many_returning(models.Refill, rows, session)
+        await apply_refill_deltas(session, added=created)
         await session.commit()
-        await session.refresh(db_refill)
     except IntegrityError as e:
-        if "brand" in str(e.orig):
-            raise RelatedEntityDoesNotExistError("Brand with this id does not exist.")
-        elif "octane" in str(e.orig):
-            raise RelatedEntityDoesNotExistError("Octane with this id does not exist.")
-    return Refill.model_validate(db_refill)
+        await session.rollback()
+        _raise_related_entity_error(e)
+    return RefillBulkResult(
+        created=[Refill.model_validate(row) for row in created], errors=errors
+    )
 
 
 async def find_refill(id: int, session: AsyncSession) -> models.Refill:
@@ -33,40 +127,258 @@ async def find_refill(id: int, session: AsyncSession) -> models.Refill:
     return db_refill
 
 
-async def find_refills(session: AsyncSession) -> List[models.Refill]:
-    stmt = select(models.Refill).order_by(models.Refill.id)
+def _filter_conditions(filters: RefillFilter) -> List[ColumnElement]:
+    refill = models.Refill
+    conditions = []
+    if filters.date_from is not None:
+        conditions.append(refill.fill_date >= filters.date_from)
+    if filters.date_to is not None:
+        conditions.append(refill.fill_date <= filters.date_to)
+    if filters.brand_id is not None:
+        conditions.append(refill.brand_id == filters.brand_id)
+    if filters.octane_id is not None:
+        conditions.append(refill.octane_id == filters.octane_id)
+    if filters.min_cost is not None:
+        conditions.append(refill.cost >= filters.min_cost)
+    if filters.max_cost is not None:
+        conditions.append(refill.cost <= filters.max_cost)
+    if filters.min_ethanol is not None:
+        conditions.append(refill.ethanol_percent >= filters.min_ethanol)
+    if filters.max_ethanol is not None:
+        conditions.append(refill.ethanol_percent <= filters.max_ethanol)
+    return conditions
+
+
+def _parse_keyset(name: str, after: Any) -> Tuple[Any, int]:
+    try:
+        value, id = after
+        if not is_id(id):
+            raise TypeError
+        if value is not None:
+            if name == "fill_date":
+                value = date.fromisoformat(value)
+            else:
+                value = Decimal(str(value))
+    except (TypeError, ValueError, ArithmeticError):
+        raise InvalidParameterError("Invalid pagination cursor.")
+    return value, id
+
+
+def _after_condition(name: str, descending: bool, after: Any) -> ColumnElement:
+    refill_id = models.Refill.id
+    if name == "id":
+        return refill_id < after if descending else refill_id > after
+
+    value, id = _parse_keyset(name, after)
+    column = models.Refill.__table__.c[name]
+    # Postgres puts NULLs last when ascending and first when descending
+    if value is None:
+        rest = and_(column.is_(None), refill_id < id if descending else refill_id > id)
+        return or_(rest, column.is_not(None)) if descending else rest
+    if descending:
+        return tuple_(column, refill_id) < tuple_(value, id)
+    condition = tuple_(column, refill_id) > tuple_(value, id)
+    return or_(condition, column.is_(None)) if column.nullable else condition
+
+
+def refill_sort_key(filters: RefillFilter) -> Callable[[Refill], Tuple[Any, ...]]:
+    """Return the keyset of a refill under the sort order of `filters`."""
+    name = filters.sort.lstrip("-")
+    if name == "id":
+        return lambda refill: (refill.id,)
+
+    def key(refill: Refill) -> Tuple[Any, ...]:
+        value = getattr(refill, name)
+        if isinstance(value, date):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            # Raw rows on the fast JSON path hold numerics as the schema's floats would
+            value = float(value)
+        return (value, refill.id)
+
+    return key
+
+
+async def find_refills(
+    session: AsyncSession,
+    after: Optional[Any] = None,
+    limit: Optional[int] = None,
+    filters: Optional[RefillFilter] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> List[models.Refill] | List[Row]:
+    # `after` is the keyset of the previous page's last refill: its id when
+    # sorting by id, else a (value, id) pair as built by `refill_sort_key`.
+    # Given `columns`, only those are selected and plain rows are returned
+    filters = filters or RefillFilter()
+    name = filters.sort.lstrip("-")
+    descending = filters.sort.startswith("-")
+    table = models.Refill.__table__
+    column = table.c[name]
+
+    entities = [models.Refill] if columns is None else [table.c[c] for c in columns]
+    stmt = select(*entities).where(*_filter_conditions(filters))
+    if name == "id":
+        stmt = stmt.order_by(column.desc() if descending else column)
+    elif descending:
+        stmt = stmt.order_by(column.desc(), models.Refill.id.desc())
+    else:
+        stmt = stmt.order_by(column, models.Refill.id)
+    if after is not None:
+        stmt = stmt.where(_after_condition(name, descending, after))
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    if columns is not None:
+        return (await session.execute(stmt)).all()
     db_refills = (await session.scalars(stmt)).all()
     return db_refills
 
 
-async def read_refill(id: int, session: AsyncSession) -> Refill:
-    db_refill = await find_refill(id, session)
-    return Refill.model_validate(db_refill)
+# Columns of the rows `stream_refills` yields, in order
+EXPORT_COLUMNS = tuple(models.Refill.__table__.columns.keys())
+
+
+async def stream_refills(
+    session: AsyncSession, batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[Sequence[Row]]:
+    stmt = (
+        select(models.Refill.__table__)
+        .order_by(models.Refill.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(stmt)
+    async for rows in result.partitions():
+        yield rows
+
+
+def _select_fields(fields: Sequence[str]) -> Select:
+    table = models.Refill.__table__
+    return select(*(table.c[name] for name in fields))
+
+
+def _list_fields(filters: RefillFilter, fields: Sequence[str]) -> Tuple[str, ...]:
+    # The sort column is selected, whether asked for or not, to build the cursor from
+    return select_fields(Refill, {*fields, "id", filters.sort.lstrip("-")})
+
+
+def sparse_refills(rows: Sequence[Row], fields: Sequence[str]) -> List[Refill]:
+    """Validate rows as refills holding only `fields` and the id.
+
+    Other selected columns, such as the sort column of a list, are left out.
+    """
+    model = sparse_model(Refill, select_fields(Refill, {*fields, "id"}))
+    with timed("validate"):
+        return [model.model_validate(row) for row in rows]
+
+
+async def read_refill(
+    id: int, session: AsyncSession, fields: Optional[Sequence[str]] = None
+) -> Refill:
+    if fields is None:
+        db_refill = await find_refill(id, session)
+        with timed("validate"):
+            return Refill.model_validate(db_refill)
 
+    table = models.Refill.__table__
+    stmt = _select_fields(fields).where(table.c.id == id)
+    row = (await session.execute(stmt)).one_or_none()
+    if row is None:
+        raise EntityDoesNotExistError(f"Refill with id {id} does not exist.")
+    with timed("validate"):
+        return sparse_model(Refill, tuple(fields)).model_validate(row)
+
+
+async def read_refills_by_ids(
+    ids: Sequence[int], session: AsyncSession, fields: Optional[Sequence[str]] = None
+) -> List[Refill]:
+    if fields is None:
+        db_refills = await find_by_ids(models.Refill, ids, session)
+        with timed("validate"):
+            return [Refill.model_validate(db_refill) for db_refill in db_refills]
+
+    stmt = _select_fields(fields).where(id_in(models.Refill, ids))
+    rows = (await session.execute(stmt.order_by(models.Refill.id))).all()
+    model = sparse_model(Refill, tuple(fields))
+    with timed("validate"):
+        return [model.model_validate(row) for row in rows]
+
+
+async def read_refills(
+    session: AsyncSession,
+    after: Optional[Any] = None,
+    limit: Optional[int] = None,
+    filters: Optional[RefillFilter] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Refill]:
+    if fields is None:
+        db_refills = await find_refills(session, after, limit, filters)
+        with timed("validate"):
+            return [Refill.model_validate(db_refill) for db_refill in db_refills]
+
+    filters = filters or RefillFilter()
+    columns = _list_fields(filters, fields)
+    rows = await find_refills(session, after, limit, filters, columns=columns)
+    return sparse_refills(rows, fields)
 
-async def read_refills(session: AsyncSession) -> List[Refill]:
-    db_refills = await find_refills(session)
-    return [Refill.model_validate(db_refill) for db_refill in db_refills]
+
+async def read_refill_rows(
+    session: AsyncSession,
+    after: Optional[Any] = None,
+    limit: Optional[int] = None,
+    filters: Optional[RefillFilter] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> List[Row]:
+    # As `read_refills`, but the rows are returned as selected, unvalidated
+    filters = filters or RefillFilter()
+    columns = _list_fields(filters, fields or Refill.model_fields)
+    return await find_refills(session, after, limit, filters, columns=columns)
+
+
+async def _update_refill_returning(
+    id: int, values: Dict[str, Any], session: AsyncSession
+) -> Tuple[Optional[Row], Optional[Any]]:
+    # Returns the row as written along with its previous values, which the rollup
+    # needs, still in one round-trip: the CTE locks and snapshots the old row
+    table = models.Refill.__table__
+    if not values:
+        stmt = select(table).where(table.c.id == id)
+        return (await session.execute(stmt)).one_or_none(), None
+
+    old = select(table).where(table.c.id == id).with_for_update().cte("old")
+    stmt = (
+        update(table)
+        .where(table.c.id == old.c.id)
+        .values(**values)
+        .returning(*table.c, *(column.label(f"old_{column.name}") for column in old.c))
+    )
+    row = (await session.execute(stmt)).one_or_none()
+    if row is None:
+        return None, None
+    previous = SimpleNamespace(
+        **{column.name: row._mapping[f"old_{column.name}"] for column in table.c}
+    )
+    return row, previous
 
 
 async def update_refill(id: int, params: RefillUpdate, session: AsyncSession) -> Refill:
-    db_refill = await find_refill(id, session)
-    for attr, value in params.model_dump(exclude_unset=True).items():
-        setattr(db_refill, attr, value)
-    session.add(db_refill)
     try:
+        row, previous = await _update_refill_returning(
+            id, params.model_dump(exclude_unset=True), session
+        )
+        if previous is not None:
+            await apply_refill_deltas(session, added=[row], removed=[previous])
         await session.commit()
-        await session.refresh(db_refill)
     except IntegrityError as e:
-        if "brand" in str(e.orig):
-            raise RelatedEntityDoesNotExistError("Brand with this id does not exist.")
-        elif "octane" in str(e.orig):
-            raise RelatedEntityDoesNotExistError("Octane with this id does not exist.")
-    return Refill.model_validate(db_refill)
+        await session.rollback()
+        _raise_related_entity_error(e)
+    if not row:
+        raise EntityDoesNotExistError(f"Refill with id {id} does not exist.")
+    return Refill.model_validate(row)
 
 
 async def delete_refill(id: int, session: AsyncSession) -> Refill:
-    db_refill = await find_refill(id, session)
-    await session.delete(db_refill)
+    row = await delete_returning(models.Refill, id, session)
+    if not row:
+        raise EntityDoesNotExistError(f"Refill with id {id} does not exist.")
+    await apply_refill_deltas(session, removed=[row])
     await session.commit()
-    return Refill.model_validate(db_refill)
+    return Refill.model_validate(row)
@@ -0,0 +1,110 @@
+from datetime import date
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import Date, cast, delete, func, insert, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+
+MonthKey = Tuple[date, int, int]
+
+
+def _month_deltas(
+    added: Iterable[Any], removed: Iterable[Any]
+) -> Dict[MonthKey, List[Any]]:
+    deltas: Dict[MonthKey, List[Any]] = {}
+    for rows, sign in ((added, 1), (removed, -1)):
+        for row in rows:
+            # Refills without a date cannot be placed in a month
+            if row.fill_date is None:
+                continue
+            key = (row.fill_date.replace(day=1), row.brand_id, row.octane_id)
+            delta = deltas.setdefault(key, [0, Decimal(0), Decimal(0)])
+            delta[0] += sign
+            delta[1] += sign * Decimal(row.liters_filled)
+            delta[2] += sign * Decimal(row.cost)
+    return deltas
+
+
+async def apply_refill_deltas(
+    session: AsyncSession, added: Iterable[Any] = (), removed: Iterable[Any] = ()
+) -> None:
+    """Fold written and removed refills into the monthly rollup, without committing.
+
+    Deltas are merged per month, brand and octane first, so any batch of refills
+    costs a single upsert. Its rows are locked in key order, so that concurrent
+    batches touching the same months wait on each other instead of deadlocking.
+    """
+    values = [
+        {
+            "month": month,
+            "brand_id": brand_id,
+            "octane_id": octane_id,
+            "refill_count": count,
+            "liters_filled": liters,
+            "cost": cost,
+        }
+        for (month, brand_id, octane_id), (count, liters, cost) in sorted(
+            _month_deltas(added, removed).items()
+        )
+        if count or liters or cost
+    ]
+    if not values:
+        return
+
+    table = models.RefillMonthly.__table__
+    stmt = pg_insert(table).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.month, table.c.brand_id, table.c.octane_id],
+        set_={
+            column: table.c[column] + stmt.excluded[column]
+            for column in ("refill_count", "liters_filled", "cost")
+        },
+    )
+    await session.execute(stmt)
+
+
+async def rebuild_refills_monthly(session: AsyncSession) -> int:
+    """Recompute the monthly rollup from `fct_refills` and commit.
+
+    Refill writes are blocked until the rebuild commits, so none of them is lost
+    or counted twice.
+    """
+    refill = models.Refill
+    rollup = models.RefillMonthly
+    await session.execute(
+        text(f"LOCK TABLE {refill.__tablename__} IN SHARE ROW EXCLUSIVE MODE")
+    )
+    await session.execute(delete(rollup))
+
+    # A literal unit keeps the grouped expression identical to the selected one
+    month = cast(func.date_trunc(literal_column("'month'"), refill.fill_date), Date)
+    totals = (
+        select(
+            month,
+            refill.brand_id,
+            refill.octane_id,
+            func.count(),
+            func.sum(refill.liters_filled),
+            func.sum(refill.cost),
+        )
+        .where(refill.fill_date.is_not(None))
+        .group_by(month, refill.brand_id, refill.octane_id)
+    )
+    result = await session.execute(
+        insert(rollup).from_select(
+            [
+                "month",
+                "brand_id",
+                "octane_id",
+                "refill_count",
+                "liters_filled",
+                "cost",
+            ],
+            totals,
+        )
+    )
+    await session.commit()
+    return result.rowcount
@@ -0,0 +1,77 @@
+import asyncio
+import json
+from typing import Any, Optional
+
+from loguru import logger
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from core.cache import clear_caches, evict
+
+CHANNEL = "naviconomy_invalidate"
+RECONNECT_DELAY = 5.0
+
+
+async def publish_invalidation(
+    session: AsyncSession, entity: str, id: Optional[Any] = None
+) -> None:
+    """Tell every worker to evict `id` from the `entity` cache, or all of it.
+
+    The notification is sent within the session's transaction, so Postgres only
+    delivers it once the write commits and drops it on rollback.
+    """
+    payload = json.dumps({"entity": entity, "id": id})
+    await session.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+def handle_invalidation(payload: str) -> None:
+    try:
+        message = json.loads(payload)
+        entity, id = message["entity"], message.get("id")
+    except (ValueError, TypeError, KeyError):
+        logger.warning(f"Ignoring malformed invalidation message: {payload!r}")
+        return
+    logger.debug(f"Evicting {entity} {id} from cache.")
+    evict(entity, id)
+
+
+async def listen_for_invalidations(engine: AsyncEngine) -> None:
+    """Evict local cache entries as other workers publish writes, until cancelled.
+
+    The listener holds one connection from the engine's pool. It reconnects
+    whenever that connection is lost, clearing every cache first, since any
+    notification sent in the meantime was missed.
+    """
+    while True:
+        try:
+            async with engine.connect() as connection:
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                closed = asyncio.Event()
+
+                def on_notify(_connection, _pid, _channel, payload: str) -> None:
+                    handle_invalidation(payload)
+
+                def on_close(_connection) -> None:
+                    closed.set()
+
+                await driver_connection.add_listener(CHANNEL, on_notify)
+                driver_connection.add_termination_listener(on_close)
+                logger.info(f"Listening for cache invalidations on {CHANNEL}.")
+                try:
+                    await closed.wait()
+                finally:
+                    driver_connection.remove_termination_listener(on_close)
+                    if not driver_connection.is_closed():
+                        await driver_connection.remove_listener(CHANNEL, on_notify)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"Cache invalidation listener failed: {e}")
+
+        clear_caches()
+        logger.warning(
+            f"Cache invalidation listener lost its connection, "
+            f"reconnecting in {RECONNECT_DELAY}s."
+        )
+        await asyncio.sleep(RECONNECT_DELAY)
@@ -0,0 +1,53 @@
+import time
+from typing import Any, Dict
+
+from loguru import logger
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from core.metrics import Histogram
+
+# Checkouts slower than this are logged with the pool's state
+SLOW_CHECKOUT_SECONDS = 1.0
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """The default asyncpg pool, timing every checkout.
+
+    Latency covers waiting for a free connection, opening a new one and the
+    pre-ping, i.e. everything a request waits for before its first query.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkout_latency = Histogram()
+        self.checkout_timeouts = 0
+        self.waiting = 0
+
+    def connect(self):
+        self.waiting += 1
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            elapsed = time.perf_counter() - start
+            self.checkout_latency.observe(elapsed)
+            if elapsed > SLOW_CHECKOUT_SECONDS:
+                logger.warning(
+                    f"Connection checkout took {elapsed:.2f}s. {self.status()}"
+                )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "size": self.size(),
+            "checked_in": self.checkedin(),
+            "checked_out": self.checkedout(),
+            "overflow": self.overflow(),
+            "waiting": self.waiting,
+            "checkout_timeouts": self.checkout_timeouts,
+            "checkout_latency": self.checkout_latency.snapshot(),
+        }
@@ -0,0 +1,74 @@
+import asyncio
+import time
+
+from loguru import logger
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import SQLAlchemyError
+
+from core.limiter import RouteLimit
+from exceptions.exceptions import ServiceError
+from models import RateLimit
+
+from .session import DatabaseSessionManager
+
+# Seconds between each worker's deletions of keys whose buckets are empty again
+PRUNE_INTERVAL = 60.0
+
+
+class PostgresStorage:
+    """GCRA state kept in the `rate_limits` table, shared by all workers.
+
+    A request costs one upsert, which only moves the key's TAT forward if the
+    request is allowed, so concurrent workers cannot both take the last slot.
+    Keys whose TAT has passed can be deleted by `prune`, off the request path,
+    as a missing key is an empty bucket. If the database cannot be reached,
+    requests are let through.
+    """
+
+    def __init__(self, sessionmanager: DatabaseSessionManager):
+        self.sessionmanager = sessionmanager
+
+    async def acquire(self, route: RouteLimit, key: str, now: float) -> float:
+        key = f"{route.scope}:{key}"
+        interval, period = route.rate.interval, route.rate.period
+        tat = func.greatest(RateLimit.tat, now) + interval
+        stmt = (
+            insert(RateLimit)
+            .values(key=key, tat=now + interval)
+            .on_conflict_do_update(
+                index_elements=[RateLimit.key],
+                set_={"tat": tat},
+                where=tat - now <= period,
+            )
+            .returning(RateLimit.tat)
+        )
+        try:
+            async with self.sessionmanager.connect() as conn:
+                allowed = (await conn.execute(stmt)).scalar()
+                if allowed is not None:
+                    return allowed
+                current = await conn.scalar(
+                    select(RateLimit.tat).where(RateLimit.key == key)
+                )
+        # Failing to connect or to check out a connection raises outside `connect`
+        except (ServiceError, SQLAlchemyError, OSError, asyncio.TimeoutError):
+            logger.warning(f"Could not check the rate limit of {key}.")
+            return now
+        # Denied: report the TAT the request would have pushed the key to
+        return max(current, now) + interval
+
+    async def prune(self, now: float) -> int:
+        """Delete the keys whose TAT is before `now`, returning how many."""
+        async with self.sessionmanager.connect() as conn:
+            result = await conn.execute(delete(RateLimit).where(RateLimit.tat < now))
+        return result.rowcount
+
+    async def prune_every(self, interval: float = PRUNE_INTERVAL) -> None:
+        """Run `prune` every `interval` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.prune(time.time())
+            except (ServiceError, SQLAlchemyError, OSError, asyncio.TimeoutError):
+                logger.warning("Could not prune expired rate limit keys.")
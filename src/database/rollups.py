@@ -0,0 +1,25 @@
+import asyncio
+
+from loguru import logger
+
+from crud.rollups import rebuild_refills_monthly
+
+from .session import DatabaseSessionManager, sessionmanager
+
+
+async def rebuild_rollups(sessionmanager: DatabaseSessionManager) -> None:
+    async with sessionmanager.session() as session:
+        count = await rebuild_refills_monthly(session)
+    logger.info(f"Rebuilt {count} monthly refill rollup rows.")
+
+
+async def main() -> None:
+    try:
+        await rebuild_rollups(sessionmanager)
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    # One-shot backfill, run from src/: python -m database.rollups
+    asyncio.run(main())
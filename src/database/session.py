@@ -1,7 +1,19 @@
+import asyncio
 from contextlib import asynccontextmanager
-from typing import AsyncIterator
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
 
+from fastapi import Depends, Request
 from loguru import logger
+from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
     AsyncConnection,
@@ -14,20 +26,47 @@ from sqlalchemy.ext.asyncio import (
 from config.settings import settings
 from exceptions.exceptions import ServiceError
 
+from .pool import InstrumentedPool
+from .timing import time_queries
+
 DATABASE_URL = settings.database_url
 MAX_CONNECTIONS_COUNT = settings.max_connections_count
 
+# Clients send "X-Consistency: strong" to read their own writes from the primary
+CONSISTENCY_HEADER = "X-Consistency"
+
+# Seconds a replica is behind the primary; zero when it has replayed all it received
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
 
 class DatabaseSessionManager:
-    def __init__(self, host: str, **engine_kwargs):
+    def __init__(self, host: str, replica_hosts: Sequence[str] = (), **engine_kwargs):
+        engine_kwargs.setdefault("poolclass", InstrumentedPool)
         try:
             self.engine: AsyncEngine | None = create_async_engine(host, **engine_kwargs)
             self._sessionmaker: async_sessionmaker[AsyncSession] | None = (
                 async_sessionmaker(bind=self.engine, expire_on_commit=False)
             )
+            self.replica_engines: List[AsyncEngine] = [
+                create_async_engine(replica_host, **engine_kwargs)
+                for replica_host in replica_hosts
+            ]
         except SQLAlchemyError:
             logger.error("Failed to initialize database engine.")
             raise ServiceError
+        for engine in (self.engine, *self.replica_engines):
+            time_queries(engine)
+        self._replica_sessionmakers = [
+            async_sessionmaker(bind=engine, expire_on_commit=False)
+            for engine in self.replica_engines
+        ]
+        # Replicas only serve reads once a health check has passed
+        self._healthy_replicas: List[int] = []
+        self._next_replica = 0
 
     async def close(self) -> None:
         if self.engine is not None:
@@ -35,6 +74,61 @@ class DatabaseSessionManager:
             logger.info("Database engine disposed.")
             self.engine = None
             self._sessionmaker = None
+        for engine in self.replica_engines:
+            await engine.dispose()
+        self.replica_engines, self._replica_sessionmakers = [], []
+        self._healthy_replicas = []
+
+    async def _replica_lag(self, engine: AsyncEngine) -> float:
+        async with engine.connect() as connection:
+            result = await connection.execute(REPLICA_LAG_QUERY)
+            return float(result.scalar() or 0)
+
+    async def check_replicas(self, max_lag: float, timeout: float = 2.0) -> None:
+        """Mark replicas that answer and lag at most `max_lag` seconds as healthy.
+
+        Replicas are checked concurrently, and each gets `timeout` seconds to
+        connect and answer, so an unreachable one cannot hold the others up.
+        """
+        lags = await asyncio.gather(
+            *(
+                asyncio.wait_for(self._replica_lag(engine), timeout)
+                for engine in self.replica_engines
+            ),
+            return_exceptions=True,
+        )
+        healthy = []
+        for index, lag in enumerate(lags):
+            if isinstance(lag, BaseException):
+                logger.warning(f"Replica {index} failed its health check: {lag!r}")
+                continue
+            if lag > max_lag:
+                logger.warning(f"Replica {index} is {lag:.1f}s behind the primary.")
+                continue
+            healthy.append(index)
+        if healthy != self._healthy_replicas:
+            logger.info(f"Healthy replicas: {healthy or 'none, reading from primary'}.")
+        self._healthy_replicas = healthy
+
+    async def monitor_replicas(self, interval: float, max_lag: float) -> None:
+        """Re-run `check_replicas` every `interval` seconds until cancelled."""
+        while True:
+            await self.check_replicas(max_lag)
+            await asyncio.sleep(interval)
+
+    def replica_sessionmaker(self) -> Optional[async_sessionmaker[AsyncSession]]:
+        """Pick a healthy replica round-robin, or `None` to read from the primary."""
+        healthy = self._healthy_replicas
+        if not healthy:
+            return None
+        self._next_replica = (self._next_replica + 1) % len(healthy)
+        return self._replica_sessionmakers[healthy[self._next_replica]]
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """Return the live state of the connection pool, or `{}` without one."""
+        if self.engine is None or not isinstance(self.engine.pool, InstrumentedPool):
+            return {}
+        return self.engine.pool.stats()
 
     @asynccontextmanager
     async def connect(self) -> AsyncIterator[AsyncConnection]:
@@ -52,13 +146,17 @@ class DatabaseSessionManager:
                 raise ServiceError
 
     @asynccontextmanager
-    async def session(self) -> AsyncIterator[AsyncSession]:
-        if self._sessionmaker is None:
+    async def session(
+        self, sessionmaker: Optional[async_sessionmaker[AsyncSession]] = None
+    ) -> AsyncIterator[AsyncSession]:
+        """Open a session on the primary, or from `sessionmaker` if given."""
+        sessionmaker = sessionmaker or self._sessionmaker
+        if sessionmaker is None:
             logger.error("Sessionmaker is unavailable.")
             raise ServiceError
 
         logger.debug("Opening database session.")
-        session = self._sessionmaker()
+        session = sessionmaker()
         try:
             yield session
         except SQLAlchemyError:
@@ -67,14 +165,57 @@ class DatabaseSessionManager:
             raise ServiceError
         finally:
             await session.close()
-            logger.info("Database session closed.")
+            logger.debug("Database session closed.")
 
 
 sessionmanager = DatabaseSessionManager(
-    DATABASE_URL.get_secret_value(), pool_size=MAX_CONNECTIONS_COUNT
+    DATABASE_URL.get_secret_value(),
+    [url.get_secret_value() for url in settings.db_replica_urls],
+    pool_size=MAX_CONNECTIONS_COUNT,
+    max_overflow=settings.db_pool_max_overflow,
+    pool_timeout=settings.db_pool_timeout,
+    pool_recycle=settings.db_pool_recycle,
+    pool_pre_ping=settings.db_pool_pre_ping,
 )
 
 
 async def get_db_session():
+    """Yield the request's database session.
+
+    FastAPI caches dependencies per request, so the auth dependency and the route
+    handler share this one session. It is lazy: a pooled connection is only
+    checked out by its first query, so requests answered from cache never take
+    one.
+    """
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_read_session(
+    request: Request, db: AsyncSession = Depends(get_db_session)
+) -> AsyncIterator[AsyncSession]:
+    """Yield a session for read-only routes, on a healthy replica when possible.
+
+    Falls back to the request's primary session when no replica is healthy, for
+    anything other than GET, and when the client asks for strong consistency via
+    the `X-Consistency` header, e.g. to read back a write it just made.
+    """
+    sessionmaker = None
+    strong = request.headers.get(CONSISTENCY_HEADER, "").lower() == "strong"
+    if request.method in ("GET", "HEAD") and not strong:
+        sessionmaker = sessionmanager.replica_sessionmaker()
+    if sessionmaker is None:
+        yield db
+        return
+    async with sessionmanager.session(sessionmaker) as session:
+        yield session
+
+
+def get_db_session_factory() -> Callable[[], AsyncContextManager[AsyncSession]]:
+    """Return a factory for sessions that outlive the request's dependencies.
+
+    Streaming responses keep reading from the database after the route returns,
+    so they open their own session inside the response body instead of using
+    `get_db_session`, whose teardown may run before the body is sent.
+    """
+    return sessionmanager.session
@@ -1,8 +1,105 @@
-from models import Base
+from typing import Awaitable, Callable, List, Optional
+
+from loguru import logger
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from config.constants import SCHEMA_VERSION
+from models import Base, Refill, SchemaVersion
+from models.refill import FILL_DATE_INDEX_NAMES, fill_date_index
 
 from .session import DatabaseSessionManager
 
+# Arbitrary key for the advisory lock serializing migrations across workers
+SCHEMA_LOCK_ID = 4_801_537
+
+
+async def _create_all(conn: AsyncConnection) -> None:
+    await conn.run_sync(Base.metadata.create_all)
+
+
+async def _create_missing_refill_indexes(conn: AsyncConnection) -> None:
+    def create_indexes(sync_conn) -> None:
+        for index in Refill.__table__.indexes:
+            index.create(sync_conn, checkfirst=True)
+
+    await conn.run_sync(create_indexes)
+
+
+async def _other_fill_date_indexes(conn: AsyncConnection) -> List[str]:
+    """Return the `fill_date` indexes of the variants other than the configured one."""
+    names = []
+    for name in FILL_DATE_INDEX_NAMES.values():
+        if name == fill_date_index.name:
+            continue
+        if await conn.scalar(text("SELECT to_regclass(:name)"), {"name": name}):
+            names.append(name)
+    return names
+
+
+async def _switch_fill_date_index(conn: AsyncConnection) -> None:
+    # Builds the new index before dropping the old, so date filters keep one
+    await conn.run_sync(fill_date_index.create, checkfirst=True)
+    for name in await _other_fill_date_indexes(conn):
+        await conn.execute(text(f"DROP INDEX {name}"))
+    logger.info(f"Switched the fill_date index of refills to {fill_date_index.name}.")
+
+
+# Step i brings the schema from version i to i + 1. create_all only creates
+# missing tables, so later changes to existing tables need their own steps
+MIGRATIONS: List[Callable[[AsyncConnection], Awaitable[None]]] = [
+    _create_all,
+    # (fill_date, id), (brand_id, fill_date) and (octane_id, fill_date)
+    _create_missing_refill_indexes,
+    # (odometer, id)
+    _create_missing_refill_indexes,
+    # rate_limits
+    _create_all,
+]
+
+
+async def get_schema_version(conn: AsyncConnection) -> Optional[int]:
+    """Return the version the database was migrated to, or `None` if it never was."""
+    if (await conn.execute(text("SELECT to_regclass('schema_version')"))).scalar():
+        return await conn.scalar(
+            select(SchemaVersion.version).where(SchemaVersion.id == 1)
+        )
+    return None
+
 
 async def create_tables(sessionmanager: DatabaseSessionManager) -> None:
+    """Migrate the database to `SCHEMA_VERSION`, doing nothing if it is already there.
+
+    An up-to-date database costs a few single-row reads. Otherwise one worker
+    migrates under an advisory lock while the others wait on it, and then find
+    the new version and skip. The `fill_date` index of refills is also switched
+    to the variant of `refills_fill_date_index` when that setting changed.
+    """
     async with sessionmanager.connect() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        version = await get_schema_version(conn)
+        if (
+            version is not None
+            and version >= SCHEMA_VERSION
+            and not await _other_fill_date_indexes(conn)
+        ):
+            logger.info(f"Database schema is at version {version}.")
+            return
+
+        await conn.execute(select(func.pg_advisory_xact_lock(SCHEMA_LOCK_ID)))
+        version = await get_schema_version(conn) or 0
+        if version < SCHEMA_VERSION:
+            for step in range(version, SCHEMA_VERSION):
+                await MIGRATIONS[step](conn)
+            stmt = insert(SchemaVersion).values(id=1, version=SCHEMA_VERSION)
+            await conn.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[SchemaVersion.id],
+                    set_={"version": SCHEMA_VERSION, "applied_at": func.now()},
+                )
+            )
+            logger.info(
+                f"Migrated database schema from version {version} to {SCHEMA_VERSION}."
+            )
+        if await _other_fill_date_indexes(conn):
+            await _switch_fill_date_index(conn)
@@ -0,0 +1,33 @@
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.context import request_context
+from core.metrics import Histogram
+
+# Latency of every query run by the instrumented engines
+query_latency = Histogram()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, many):
+    conn.info["query_start"] = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, many):
+    elapsed = time.perf_counter() - conn.info.pop("query_start")
+    query_latency.observe(elapsed)
+    request = request_context.get()
+    if request is not None:
+        request.db_time += elapsed
+        request.db_queries += 1
+
+
+def time_queries(engine: AsyncEngine) -> None:
+    """Time `engine`'s queries, adding their time to the request running them.
+
+    SQLAlchemy runs them in greenlets sharing the caller's context, so the
+    request is found through `core.context.request_context`.
+    """
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
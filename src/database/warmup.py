@@ -0,0 +1,64 @@
+import asyncio
+import time
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+import models
+from auth.services import get_user_by_username
+from crud import brands, octanes, refills
+from crud.base import find_by_ids
+
+from .session import DatabaseSessionManager
+
+
+async def prime_statements(connection: AsyncConnection) -> None:
+    """Run the hot read queries once so the connection has them prepared.
+
+    They go through the same code as real requests, so the SQL, and with it
+    asyncpg's prepared statement cache key, is identical.
+    """
+    session = AsyncSession(bind=connection)
+    try:
+        for model in (models.Brand, models.Octane, models.Refill):
+            await session.get(model, 0)
+        await brands.find_brands(session)
+        await octanes.find_octanes(session)
+        for model in (models.Brand, models.Octane):
+            await find_by_ids(model, [0], session)
+        await refills.find_refills(session, limit=1)
+        await refills.find_refills(session, after=0, limit=1)
+        await get_user_by_username("", session)
+    finally:
+        await session.close()
+
+
+async def warm_up(sessionmanager: DatabaseSessionManager, connections: int) -> None:
+    """Open `connections` pooled connections and prime each one."""
+    if connections < 1:
+        return
+
+    start = time.perf_counter()
+    opened = 0
+    all_opened = asyncio.Event()
+
+    async def open_and_prime() -> None:
+        nonlocal opened
+        try:
+            async with sessionmanager.connect() as connection:
+                await prime_statements(connection)
+                # Hold on until every connection is open, so none is reused
+                opened += 1
+                if opened == connections:
+                    all_opened.set()
+                await all_opened.wait()
+        except BaseException:
+            # Release the others rather than leave them waiting forever
+            all_opened.set()
+            raise
+
+    await asyncio.gather(*(open_and_prime() for _ in range(connections)))
+    logger.info(
+        f"Warmed up {connections} database connection(s) "
+        f"in {time.perf_counter() - start:.3f}s."
+    )
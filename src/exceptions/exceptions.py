@@ -15,6 +15,25 @@ class ServiceError(NaviconomyApiError):
     pass
 
 
+class ServiceUnavailableError(NaviconomyApiError):
+    """Service is temporarily overloaded."""
+
+    pass
+
+
+class RateLimitExceededError(NaviconomyApiError):
+    """Too many requests, retry after `retry_after` seconds."""
+
+    def __init__(
+        self,
+        message: str = "Rate limit exceeded.",
+        name: str = "NaviconomyApi",
+        retry_after: float = 0.0,
+    ):
+        self.retry_after = retry_after
+        super().__init__(message, name)
+
+
 class EntityAlreadyExistsError(NaviconomyApiError):
     """Entity already exists."""
 
@@ -33,6 +52,12 @@ class RelatedEntityDoesNotExistError(NaviconomyApiError):
     pass
 
 
+class InvalidParameterError(NaviconomyApiError):
+    """Invalid request parameter."""
+
+    pass
+
+
 class RegistrationFailed(NaviconomyApiError):
     """Registration failed."""
 
@@ -1,41 +1,87 @@
-from contextlib import asynccontextmanager
+import asyncio
+import math
+from contextlib import asynccontextmanager, suppress
 from typing import Callable
 
 from fastapi import Depends, FastAPI, Request, Response, status
 from fastapi.responses import JSONResponse
+from loguru import logger
 
+from api.routes import metrics
 from api.routes.router import base_router
 from auth.dependencies import get_current_active_user
 from auth.routes import auth_router
+from auth.utils import password_executor
 from config.constants import API_PREFIX, VERSION
 from config.settings import settings
+from core.context import RequestContextMiddleware
+from core.limiter import limiter
 from core.log import setup_logging
+from core.timing import ServerTimingMiddleware
+from database.invalidation import listen_for_invalidations
+from database.rate_limits import PostgresStorage
 from database.session import sessionmanager
 from database.tables import create_tables
+from database.warmup import warm_up
 from exceptions.exceptions import (
     AuthenticationFailed,
     EntityAlreadyExistsError,
     EntityDoesNotExistError,
     InvalidAccountError,
+    InvalidParameterError,
     InvalidTokenError,
     NaviconomyApiError,
+    RateLimitExceededError,
     RegistrationFailed,
     RelatedEntityDoesNotExistError,
     ServiceError,
+    ServiceUnavailableError,
 )
 
-setup_logging(settings.debug)
+setup_logging(
+    settings.debug,
+    serialize=settings.log_json,
+    enqueue=settings.log_enqueue,
+    sample_rate=settings.log_sample_rate,
+)
 
 
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
+    listener = replica_monitor = metrics_writer = rate_limit_pruner = None
     if sessionmanager.engine is not None:
         await create_tables(sessionmanager)
+        try:
+            await warm_up(sessionmanager, settings.min_connections_count)
+        except Exception as e:
+            logger.warning(f"Database warm-up failed: {e}")
+        listener = asyncio.create_task(listen_for_invalidations(sessionmanager.engine))
+        if settings.rate_limit_storage == "postgres":
+            limiter.storage = storage = PostgresStorage(sessionmanager)
+            rate_limit_pruner = asyncio.create_task(storage.prune_every())
+    if sessionmanager.replica_engines:
+        await sessionmanager.check_replicas(settings.db_replica_max_lag)
+        replica_monitor = asyncio.create_task(
+            sessionmanager.monitor_replicas(
+                settings.db_replica_check_interval, settings.db_replica_max_lag
+            )
+        )
+
+    if settings.metrics_enabled and metrics.directory is not None:
+        metrics_writer = asyncio.create_task(
+            metrics.write_metrics(settings.metrics_flush_interval)
+        )
 
     yield
 
+    for task in (listener, replica_monitor, metrics_writer, rate_limit_pruner):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
     if sessionmanager.engine is not None:
-        sessionmanager.close()
+        await sessionmanager.close()
+    password_executor.shutdown()
 
 
 app = FastAPI(
@@ -44,10 +90,16 @@ app = FastAPI(
     version=VERSION,
     lifespan=lifespan,
 )
+# Added first to run inside RequestContextMiddleware, whose context it fills in
+if settings.server_timing:
+    app.add_middleware(ServerTimingMiddleware)
+app.add_middleware(RequestContextMiddleware, sample_rate=settings.log_sample_rate)
 app.include_router(
     base_router, prefix=API_PREFIX, dependencies=[Depends(get_current_active_user)]
 )
 app.include_router(auth_router, prefix=API_PREFIX)
+if settings.metrics_enabled:
+    app.include_router(metrics.router)
 
 
 @app.get("/")
@@ -95,6 +147,14 @@ app.add_exception_handler(
     ),
 )
 
+app.add_exception_handler(
+    exc_class_or_status_code=InvalidParameterError,
+    handler=create_exception_handler(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        initial_message="Invalid request parameter.",
+    ),
+)
+
 app.add_exception_handler(
     exc_class_or_status_code=RegistrationFailed,
     handler=create_exception_handler(
@@ -134,3 +194,31 @@ app.add_exception_handler(
         initial_message="A service seems to be down. Please try again later.",
     ),
 )
+
+app.add_exception_handler(
+    exc_class_or_status_code=ServiceUnavailableError,
+    handler=create_exception_handler(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        initial_message="Server is busy. Please try again later.",
+    ),
+)
+
+
+too_many_requests_handler = create_exception_handler(
+    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+    initial_message="Too many requests.",
+)
+
+
+async def rate_limit_exceeded_handler(
+    request: Request, exc: RateLimitExceededError
+) -> JSONResponse:
+    response = await too_many_requests_handler(request, exc)
+    response.headers["Retry-After"] = str(math.ceil(exc.retry_after))
+    return response
+
+
+app.add_exception_handler(
+    exc_class_or_status_code=RateLimitExceededError,
+    handler=rate_limit_exceeded_handler,
+)
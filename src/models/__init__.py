@@ -1,4 +1,7 @@
 from .base import Base  # type: ignore # noqa
 from .brand import Brand    # type: ignore # noqa
 from .octane import Octane  # type: ignore # noqa
-from .refill import Refill  # type: ignore # noqa
\ No newline at end of file
+from .rate_limit import RateLimit  # type: ignore # noqa
+from .refill import Refill  # type: ignore # noqa
+from .refill_monthly import RefillMonthly  # type: ignore # noqa
+from .schema_version import SchemaVersion  # type: ignore # noqa
\ No newline at end of file
@@ -0,0 +1,19 @@
+from typing import Optional
+
+from sqlalchemy import Double, Integer, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RateLimit(Base):
+    """GCRA state of a rate limit key, shared by all workers."""
+
+    __tablename__ = "rate_limits"
+
+    id: Mapped[Optional[int]] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, nullable=False
+    )
+    key: Mapped[str] = mapped_column(Text, unique=True)
+    # Theoretical arrival time, as a Unix timestamp
+    tat: Mapped[float] = mapped_column(Double)
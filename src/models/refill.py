@@ -1,14 +1,47 @@
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import Date, ForeignKey, Integer, Numeric
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
+from config.settings import settings
+
 from .base import Base
 
+# BRIN is far smaller than a B-tree on a large, append-only table whose rows
+# arrive in date order, but cannot serve keyset ordering by date
+FILL_DATE_INDEX_NAMES = {
+    "btree": "ix_fct_refills_fill_date",
+    "brin": "ix_fct_refills_fill_date_brin",
+}
+if settings.refills_fill_date_index == "brin":
+    fill_date_index = Index(
+        FILL_DATE_INDEX_NAMES["brin"], "fill_date", postgresql_using="brin"
+    )
+else:
+    fill_date_index = Index(FILL_DATE_INDEX_NAMES["btree"], "fill_date", "id")
+
 
 class Refill(Base):
     __tablename__ = "fct_refills"
+    # The dimension indexes also serve the foreign key checks on deleting a brand
+    # or octane, and carry the summed columns so totals need no heap access
+    __table_args__ = (
+        fill_date_index,
+        Index("ix_fct_refills_odometer", "odometer", "id"),
+        Index(
+            "ix_fct_refills_brand_id_fill_date",
+            "brand_id",
+            "fill_date",
+            postgresql_include=["liters_filled", "cost"],
+        ),
+        Index(
+            "ix_fct_refills_octane_id_fill_date",
+            "octane_id",
+            "fill_date",
+            postgresql_include=["liters_filled", "cost"],
+        ),
+    )
 
     id: Mapped[Optional[int]] = mapped_column(
         Integer, primary_key=True, index=True, autoincrement=True, nullable=False
@@ -0,0 +1,24 @@
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Date, Integer, Numeric, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class RefillMonthly(Base):
+    """Monthly refill totals per brand and octane, maintained by `crud.refills`."""
+
+    __tablename__ = "agg_refills_monthly"
+    __table_args__ = (UniqueConstraint("month", "brand_id", "octane_id"),)
+
+    id: Mapped[Optional[int]] = mapped_column(
+        Integer, primary_key=True, index=True, autoincrement=True, nullable=False
+    )
+    month: Mapped[date] = mapped_column(Date)
+    brand_id: Mapped[int] = mapped_column(Integer)
+    octane_id: Mapped[int] = mapped_column(Integer)
+    refill_count: Mapped[int] = mapped_column(Integer, default=0)
+    liters_filled: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
+    cost: Mapped[float] = mapped_column(Numeric(14, 2), default=0)
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import DateTime, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class SchemaVersion(Base):
+    """The schema version the database was last migrated to, in a single row."""
+
+    __tablename__ = "schema_version"
+
+    id: Mapped[Optional[int]] = mapped_column(
+        Integer, primary_key=True, autoincrement=True, nullable=False
+    )
+    version: Mapped[int] = mapped_column(Integer)
+    applied_at: Mapped[Optional[datetime]] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
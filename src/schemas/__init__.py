@@ -1,3 +1,4 @@
 from .brand import Brand, BrandCreate, BrandUpdate # type: ignore # noqa
 from .octane import Octane, OctaneCreate, OctaneUpdate # type: ignore # noqa
-from .refill import Refill, RefillCreate, RefillUpdate # type: ignore # noqa
+from .refill import Int4, Refill, RefillBulkError, RefillBulkResult, RefillCreate, RefillFilter, RefillUpdate # type: ignore # noqa
+from .analytics import RefillEconomy, RefillMonthlySummary # type: ignore # noqa
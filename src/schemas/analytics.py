@@ -0,0 +1,32 @@
+from datetime import date
+from typing import Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+class RefillEconomy(BaseModel):
+    refill_id: int
+    fill_date: Optional[date] = None
+    odometer: float
+    brand_id: int
+    octane_id: int
+    liters_filled: float
+    cost: float
+    distance: Optional[float] = None
+    km_per_liter: Optional[float] = None
+    cost_per_km: Optional[float] = None
+    price_per_liter: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True, strict=True)
+
+
+class RefillMonthlySummary(BaseModel):
+    month: date
+    brand_id: int
+    octane_id: int
+    refill_count: int
+    liters_filled: float
+    cost: float
+    price_per_liter: Optional[float] = None
+
+    model_config = ConfigDict(from_attributes=True, strict=True)
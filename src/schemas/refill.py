@@ -1,7 +1,10 @@
 from datetime import date
-from typing import Optional
+from typing import Annotated, List, Literal, Optional
 
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field, NonNegativeFloat
+
+# Ids of the Postgres `integer` columns, larger values cannot even be bound
+Int4 = Annotated[int, Field(ge=-(2**31), le=2**31 - 1)]
 
 
 class RefillBase(BaseModel):
@@ -30,4 +33,37 @@ class RefillUpdate(RefillBase):
 
 
 class Refill(RefillBase):
-    id: int
\ No newline at end of file
+    id: int
+
+
+class RefillFilter(BaseModel):
+    """Filters and sort order for refill lists, injected via `Depends()`.
+
+    `sort` names a column to order by, ascending, or descending with a leading
+    `-`. Ties are broken by id. Only columns with an index on (column, id) may be
+    sorted on, so every page is an index range scan, except `fill_date` when
+    `refills_fill_date_index` is `brin`: a BRIN index cannot return rows in
+    order, so those pages sort the rows matching the filters.
+    """
+
+    date_from: Optional[date] = None
+    date_to: Optional[date] = None
+    brand_id: Optional[Int4] = None
+    octane_id: Optional[Int4] = None
+    min_cost: Optional[NonNegativeFloat] = None
+    max_cost: Optional[NonNegativeFloat] = None
+    min_ethanol: Optional[NonNegativeFloat] = None
+    max_ethanol: Optional[NonNegativeFloat] = None
+    sort: Literal["id", "-id", "fill_date", "-fill_date", "odometer", "-odometer"] = (
+        "id"
+    )
+
+
+class RefillBulkError(BaseModel):
+    index: int
+    detail: str
+
+
+class RefillBulkResult(BaseModel):
+    created: List[Refill]
+    errors: List[RefillBulkError] = []
@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import pytest_asyncio
@@ -12,7 +13,7 @@ from sqlalchemy.ext.asyncio import (
 )
 
 from api.routes.router import base_router
-from database.session import get_db_session
+from database.session import get_db_session, get_db_session_factory
 from models import Base
 
 # Set up test app
@@ -56,7 +57,12 @@ async def async_client(
     async def override_get_db_session() -> AsyncGenerator[AsyncSession, None]:
         yield testing_session
 
+    @asynccontextmanager
+    async def override_session() -> AsyncGenerator[AsyncSession, None]:
+        yield testing_session
+
     test_app.dependency_overrides[get_db_session] = override_get_db_session
+    test_app.dependency_overrides[get_db_session_factory] = lambda: override_session
 
     async with AsyncClient(
         transport=ASGITransport(app=test_app), base_url="https://test"
@@ -0,0 +1,103 @@
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from core.pagination import NEXT_CURSOR_HEADER
+from crud import rollups
+
+URL_PREFIX = "/v1/analytics/"
+
+
+async def setup(async_session: AsyncSession) -> None:
+    async_session.add_all([models.Brand(id=1, name="x"), models.Octane(id=1, grade=91)])
+    await async_session.commit()
+
+    async_session.add_all(
+        [
+            models.Refill(
+                id=1,
+                odometer=1000,
+                liters_filled=10,
+                brand_id=1,
+                octane_id=1,
+                ethanol_percent=0.1,
+                cost=500,
+            ),
+            models.Refill(
+                id=2,
+                odometer=1150,
+                liters_filled=10,
+                brand_id=1,
+                octane_id=1,
+                ethanol_percent=0.1,
+                cost=600,
+            ),
+        ]
+    )
+    await async_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_read_economy_returns_http_422_for_improper_date(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(
+        URL_PREFIX + "economy", params={"date_from": "yesterday"}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_read_economy_returns_http_422_for_out_of_range_brand_id(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(
+        URL_PREFIX + "economy", params={"brand_id": 2**40}
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_read_economy_regular(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    response = await async_client.get(URL_PREFIX + "economy", params={"brand_id": 1})
+
+    assert response.status_code == 200
+    assert response.json()[1]["km_per_liter"] == 15
+
+
+@pytest.mark.asyncio
+async def test_read_economy_pages_with_cursor(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    first = await async_client.get(URL_PREFIX + "economy", params={"limit": 1})
+    second = await async_client.get(
+        URL_PREFIX + "economy",
+        params={"limit": 1, "after": first.headers[NEXT_CURSOR_HEADER]},
+    )
+
+    assert [item["refill_id"] for item in first.json()] == [1]
+    assert [item["refill_id"] for item in second.json()] == [2]
+    assert second.json()[0]["distance"] == 150
+    assert NEXT_CURSOR_HEADER not in second.headers
+
+
+@pytest.mark.asyncio
+async def test_read_monthly_regular(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+    await rollups.rebuild_refills_monthly(testing_session)
+
+    response = await async_client.get(URL_PREFIX + "monthly", params={"brand_id": 1})
+
+    assert response.status_code == 200
+    assert len(response.json()) == 1
+    assert response.json()[0]["refill_count"] == 2
+    assert response.json()[0]["price_per_liter"] == 55
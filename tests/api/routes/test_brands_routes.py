@@ -3,6 +3,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from core.batch import MISSING_IDS_HEADER
 
 URL_PREFIX = "/v1/brands/"
 
@@ -55,6 +56,18 @@ async def test_read_brands(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_read_brands_by_ids(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+    response = await async_client.get(URL_PREFIX, params={"ids": "2,3,1"})
+
+    assert response.status_code == 200
+    assert [brand["id"] for brand in response.json()] == [1, 2]
+    assert response.headers[MISSING_IDS_HEADER] == "3"
+
+
 @pytest.mark.asyncio
 async def test_update_brand_returns_http_422_for_improper_id(
     testing_session: AsyncSession,
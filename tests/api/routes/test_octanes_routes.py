@@ -3,6 +3,7 @@ from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from core.batch import MISSING_IDS_HEADER
 
 URL_PREFIX = "/v1/octanes/"
 
@@ -52,6 +53,18 @@ async def test_read_octanes(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_read_octanes_by_ids(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+    response = await async_client.get(URL_PREFIX, params={"ids": "2"})
+
+    assert response.status_code == 200
+    assert [octane["grade"] for octane in response.json()] == [95]
+    assert MISSING_IDS_HEADER not in response.headers
+
+
 @pytest.mark.asyncio
 async def test_update_octane_returns_http_422_for_improper_id(
     async_client: AsyncClient,
@@ -1,8 +1,14 @@
+import json
+
 import pytest
 from httpx import AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from config.settings import settings
+from core.batch import MISSING_IDS_HEADER
+from core.pagination import NEXT_CURSOR_HEADER
+from crud import refills
 
 URL_PREFIX = "/v1/refills/"
 
@@ -147,6 +153,39 @@ async def test_create_refill_regular(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_create_refills_returns_http_422_for_empty_batch(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.post(URL_PREFIX + "bulk", json=[])
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_create_refills_regular(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup_dimension_tables(testing_session)
+    refill = {
+        "odometer": 123.5,
+        "liters_filled": 3.5,
+        "brand_id": 1,
+        "octane_id": 2,
+        "ethanol_percent": 0.1,
+        "cost": 200.5,
+    }
+
+    response = await async_client.post(
+        URL_PREFIX + "bulk",
+        params={"partial": True},
+        json=[refill, {**refill, "brand_id": 1000}],
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["created"]) == 1
+    assert response.json()["errors"][0]["index"] == 1
+
+
 @pytest.mark.asyncio
 async def test_read_refill_returns_http_422(async_client: AsyncClient) -> None:
     response = await async_client.get(URL_PREFIX + "not id")
@@ -171,6 +210,161 @@ async def test_read_refills(
     assert response.status_code == 200
 
 
+@pytest.mark.asyncio
+async def test_read_refills_paginates(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    response = await async_client.get(URL_PREFIX, params={"limit": 1})
+    assert response.status_code == 200
+    assert [refill["id"] for refill in response.json()] == [1]
+
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = await async_client.get(URL_PREFIX, params={"limit": 1, "after": cursor})
+    assert response.status_code == 200
+    assert [refill["id"] for refill in response.json()] == [2]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_read_refills_filters_and_sorts(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    response = await async_client.get(URL_PREFIX, params={"min_cost": 180})
+    assert [refill["id"] for refill in response.json()] == [2]
+
+    params = {"sort": "-odometer", "limit": 1}
+    response = await async_client.get(URL_PREFIX, params=params)
+    assert [refill["id"] for refill in response.json()] == [2]
+
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = await async_client.get(URL_PREFIX, params={**params, "after": cursor})
+    assert [refill["id"] for refill in response.json()] == [1]
+
+
+@pytest.mark.asyncio
+async def test_read_refills_returns_only_requested_fields(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    params = {"fields": "cost", "sort": "-odometer", "limit": 1}
+    response = await async_client.get(URL_PREFIX, params=params)
+    assert response.status_code == 200
+    assert response.json() == [{"cost": 200.5, "id": 2}]
+
+    cursor = response.headers[NEXT_CURSOR_HEADER]
+    response = await async_client.get(URL_PREFIX, params={**params, "after": cursor})
+    assert [refill["id"] for refill in response.json()] == [1]
+
+
+@pytest.mark.asyncio
+async def test_read_refills_with_fast_json_matches_default(
+    testing_session: AsyncSession,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await setup(testing_session)
+    params = {"sort": "-odometer", "limit": 1}
+    expected = await async_client.get(URL_PREFIX, params=params)
+
+    monkeypatch.setattr(settings, "fast_json", True)
+    response = await async_client.get(URL_PREFIX, params=params)
+    sparse = await async_client.get(URL_PREFIX, params={**params, "fields": "cost"})
+
+    assert response.content == expected.content
+    assert response.headers[NEXT_CURSOR_HEADER] == expected.headers[NEXT_CURSOR_HEADER]
+    assert sparse.json() == [{"cost": 200.5, "id": 2}]
+
+
+@pytest.mark.asyncio
+async def test_read_refill_returns_only_requested_fields(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+    response = await async_client.get(URL_PREFIX + "1", params={"fields": "brand_id"})
+    assert response.status_code == 200
+    assert response.json() == {"brand_id": 1, "id": 1}
+
+
+@pytest.mark.asyncio
+async def test_read_refills_by_ids(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+    params = {"ids": "2,4", "fields": "cost"}
+    response = await async_client.get(URL_PREFIX, params=params)
+
+    assert response.status_code == 200
+    assert response.json() == [{"cost": 200.5, "id": 2}]
+    assert response.headers[MISSING_IDS_HEADER] == "4"
+
+
+@pytest.mark.asyncio
+async def test_read_refills_returns_http_422_for_unsortable_column(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(URL_PREFIX, params={"sort": "cost"})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_read_refills_returns_http_422_for_improper_limit(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(URL_PREFIX, params={"limit": 0})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_export_refills_as_ndjson(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    response = await async_client.get(URL_PREFIX + "export")
+    lines = response.text.splitlines()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert len(lines) == 2
+    assert json.loads(lines[1])["odometer"] == 456.5
+
+
+@pytest.mark.asyncio
+async def test_export_refills_as_csv(
+    testing_session: AsyncSession, async_client: AsyncClient
+) -> None:
+    await setup(testing_session)
+
+    response = await async_client.get(URL_PREFIX + "export", params={"format": "csv"})
+    lines = response.text.splitlines()
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert lines[0].startswith("id,fill_date,odometer")
+    assert len(lines) == 3
+
+
+@pytest.mark.asyncio
+async def test_export_refills_as_csv_without_refills(async_client: AsyncClient) -> None:
+    response = await async_client.get(URL_PREFIX + "export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.text.splitlines() == [",".join(refills.EXPORT_COLUMNS)]
+
+
+@pytest.mark.asyncio
+async def test_export_refills_returns_http_422_for_improper_format(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(URL_PREFIX + "export", params={"format": "xml"})
+    assert response.status_code == 422
+
+
 @pytest.mark.asyncio
 async def test_update_refill_returns_http_422_for_improper_id(
     async_client: AsyncClient,
@@ -295,3 +489,11 @@ async def test_delete_refill_regular(
     await setup(testing_session)
     response = await async_client.delete(URL_PREFIX + "2")
     assert response.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_read_refills_returns_http_422_for_out_of_range_brand_id(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(URL_PREFIX, params={"brand_id": 2**40})
+    assert response.status_code == 422
@@ -24,3 +24,11 @@ async def test_base_router_refills_route_is_registered(
 ) -> None:
     response = await async_client.get("/v1/refills/")
     assert response.status_code != 404
+
+
+@pytest.mark.asyncio
+async def test_base_router_analytics_route_is_registered(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get("/v1/analytics/economy")
+    assert response.status_code != 404
@@ -2,6 +2,7 @@ from datetime import datetime
 
 import pytest
 from pydantic import SecretStr
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from auth.dependencies import get_current_active_user, get_current_user
@@ -56,6 +57,22 @@ async def test_get_current_user_regular(testing_data, testing_session) -> None:
     assert user.is_active
 
 
+@pytest.mark.asyncio
+async def test_get_current_user_is_served_from_cache(
+    testing_data, testing_session
+) -> None:
+    await setup(testing_data, testing_session)
+    token = create_access_token({"sub": testing_data["username"]})
+    await get_current_user(token, testing_session)
+
+    # The users table is not read again within the TTL
+    await testing_session.execute(delete(DBUser))
+    await testing_session.commit()
+    user = await get_current_user(token, testing_session)
+
+    assert user.username == testing_data["username"]
+
+
 @pytest.mark.asyncio
 async def test_get_current_active_user_raises_InvalidAccountError() -> None:
     # Create a deactivated user
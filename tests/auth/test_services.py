@@ -3,12 +3,16 @@ from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import SecretStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import auth.services
 from auth.models import DBUser, RegisterUserRequest, Token, User
 from auth.services import (
     authenticate_user,
+    get_cached_user,
     get_user_by_username,
     login_for_access_token,
     register_user,
+    set_user_active,
+    user_cache,
 )
 from auth.utils import get_password_hash
 from exceptions.exceptions import AuthenticationFailed, RegistrationFailed
@@ -146,6 +150,71 @@ async def test_get_user_by_username_regular(testing_data, testing_session) -> No
     assert user.username == testing_data["username"]
 
 
+@pytest.mark.asyncio
+async def test_get_cached_user_returns_None_for_nonexistent_user(
+    testing_session,
+) -> None:
+    user = await get_cached_user("not a user", testing_session)
+
+    assert user is None
+    assert user_cache.get("not a user") is None
+
+
+@pytest.mark.asyncio
+async def test_get_cached_user_regular(testing_data, testing_session) -> None:
+    await setup(testing_data, testing_session)
+
+    user = await get_cached_user(testing_data["username"], testing_session)
+
+    assert isinstance(user, User)
+    assert user_cache.get(testing_data["username"]) == user
+
+
+@pytest.mark.asyncio
+async def test_get_cached_user_does_not_cache_a_user_evicted_while_reading(
+    testing_data, testing_session, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await setup(testing_data, testing_session)
+    get_user = auth.services.get_user_by_username
+
+    async def get_user_during_deactivation(username: str, session: AsyncSession):
+        db_user = await get_user(username, session)
+        # The account is disabled while the lookup is waiting on the database
+        user_cache.evict(username)
+        return db_user
+
+    monkeypatch.setattr(
+        auth.services, "get_user_by_username", get_user_during_deactivation
+    )
+    await get_cached_user(testing_data["username"], testing_session)
+
+    assert user_cache.get(testing_data["username"]) is None
+
+
+@pytest.mark.asyncio
+async def test_set_user_active_returns_None_for_nonexistent_user(
+    testing_session,
+) -> None:
+    user = await set_user_active("not a user", False, testing_session)
+
+    assert user is None
+
+
+@pytest.mark.asyncio
+async def test_set_user_active_evicts_cached_user(
+    testing_data, testing_session
+) -> None:
+    await setup(testing_data, testing_session)
+    await get_cached_user(testing_data["username"], testing_session)
+
+    user = await set_user_active(testing_data["username"], False, testing_session)
+    cached_user = await get_cached_user(testing_data["username"], testing_session)
+
+    assert isinstance(user, User)
+    assert not user.is_active
+    assert not cached_user.is_active
+
+
 @pytest.mark.asyncio
 async def test_authenticate_user_returns_None_for_nonexistent_user(
     testing_session,
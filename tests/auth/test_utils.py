@@ -9,7 +9,9 @@ from auth.models import TokenData
 from auth.utils import (
     create_access_token,
     get_password_hash,
+    get_password_hash_async,
     verify_password,
+    verify_password_async,
     verify_token,
 )
 from config.settings import settings
@@ -34,6 +36,16 @@ def test_get_password_hash_randomness(testing_data) -> None:
     assert hash1 != hash2
 
 
+@pytest.mark.asyncio
+async def test_async_password_hash_and_verify(testing_data) -> None:
+    password = SecretStr(testing_data["password"])
+
+    hashed_password = await get_password_hash_async(password)
+
+    assert await verify_password_async(password, hashed_password)
+    assert not await verify_password_async(SecretStr("wrong"), hashed_password)
+
+
 def test_verify_password_returns_False_for_incorrect_password(testing_data) -> None:
     hashed_password = get_password_hash(SecretStr(testing_data["password"]))
     wrong_password = SecretStr("wrongpassword")
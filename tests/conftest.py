@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 import pytest
@@ -13,7 +14,10 @@ from sqlalchemy.ext.asyncio import (
 
 from auth.dependencies import get_current_active_user
 from auth.models import User
-from database.session import get_db_session
+from config.settings import settings
+from core.cache import clear_caches
+from core.limiter import MemoryStorage, limiter
+from database.session import get_db_session, get_db_session_factory
 from main import app
 from models import Base
 
@@ -58,6 +62,18 @@ TEST_DATA = {
 }
 
 
+@pytest.fixture(autouse=True)
+def clear_process_caches() -> None:
+    # Every test recreates the tables, so nothing cached by a previous one is valid
+    clear_caches()
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limits() -> None:
+    # Every test calls the routes from the same address
+    limiter.storage = MemoryStorage(settings.rate_limit_max_keys)
+
+
 @pytest.fixture
 def testing_data() -> dict:
     return TEST_DATA.copy()
@@ -105,7 +121,12 @@ async def async_client(
     async def override_user() -> AsyncGenerator[User, None]:
         yield override_get_current_active_user
 
+    @asynccontextmanager
+    async def override_session() -> AsyncGenerator[AsyncSession, None]:
+        yield testing_session
+
     app.dependency_overrides[get_db_session] = override_db
+    app.dependency_overrides[get_db_session_factory] = lambda: override_session
     app.dependency_overrides[get_current_active_user] = override_user
 
     async with AsyncClient(
@@ -0,0 +1,42 @@
+import pytest
+from fastapi import Response
+
+from config.constants import MAX_BATCH_IDS
+from core.batch import MISSING_IDS_HEADER, parse_ids, report_missing
+from exceptions.exceptions import InvalidParameterError
+
+
+class Item:
+    def __init__(self, id: int):
+        self.id = id
+
+
+def test_parse_ids_returns_None_when_not_requested() -> None:
+    assert parse_ids(None) is None
+
+
+def test_parse_ids_sorts_and_deduplicates() -> None:
+    assert parse_ids("3, 1,2,1,") == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "ids",
+    ["1,two", "", ",", str(2**31), ",".join(map(str, range(MAX_BATCH_IDS + 1)))],
+)
+def test_parse_ids_raises_InvalidParameterError(ids: str) -> None:
+    with pytest.raises(InvalidParameterError):
+        parse_ids(ids)
+
+
+def test_report_missing_sets_header() -> None:
+    response = Response()
+    items = [Item(1), Item(3)]
+
+    assert report_missing([1, 2, 3, 4], items, response) is items
+    assert response.headers[MISSING_IDS_HEADER] == "2,4"
+
+
+def test_report_missing_sets_no_header_when_all_found() -> None:
+    response = Response()
+    report_missing([1], [Item(1)], response)
+    assert MISSING_IDS_HEADER not in response.headers
@@ -0,0 +1,71 @@
+import time
+
+from core.cache import TTLCache, caches, clear_caches, get_cache
+
+
+def test_get_counts_hits_and_misses() -> None:
+    cache = TTLCache("test", maxsize=10, ttl=60)
+    cache.set("key", "value")
+
+    assert cache.get("key") == "value"
+    assert cache.get("other") is None
+    assert cache.stats() == {"size": 1, "hits": 1, "misses": 1}
+
+
+def test_entries_expire_after_ttl() -> None:
+    cache = TTLCache("test", maxsize=10, ttl=0.01)
+    cache.set("key", "value")
+
+    time.sleep(0.02)
+
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    cache = TTLCache("test", maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_invalidate_and_clear() -> None:
+    cache = TTLCache("test", maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_get_cache_returns_registered_cache() -> None:
+    cache = get_cache("test-registry", maxsize=5, ttl=1)
+    cache.set("key", "value")
+
+    assert get_cache("test-registry") is cache
+    assert caches["test-registry"].maxsize == 5
+
+    clear_caches()
+    assert len(cache) == 0
+
+
+def test_set_skips_values_read_before_an_eviction() -> None:
+    cache = TTLCache("test", maxsize=10, ttl=60)
+    generation = cache.generation
+
+    cache.evict("a")
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+    cache.set("a", "fresh", cache.generation)
+    assert cache.get("a") == "fresh"
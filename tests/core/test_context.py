@@ -0,0 +1,59 @@
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from loguru import logger
+
+from core.context import RequestContextMiddleware, request_context
+
+
+@pytest.fixture
+def records() -> List[dict]:
+    records: List[dict] = []
+    handler_id = logger.add(
+        lambda message: records.append(message.record), filter="core.context"
+    )
+    yield records
+    logger.remove(handler_id)
+
+
+def make_client(sample_rate: float = 1.0) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestContextMiddleware, sample_rate=sample_rate)
+
+    @app.get("/items/{id}")
+    async def read_item(id: int) -> dict:
+        context = request_context.get()
+        context.db_queries += 1
+        return {"sampled": context.sampled}
+
+    return TestClient(app)
+
+
+def test_middleware_returns_client_request_id(records: List[dict]) -> None:
+    response = make_client().get("/items/1", headers={"X-Request-Id": "abc-123"})
+
+    assert response.headers["X-Request-Id"] == "abc-123"
+    assert records[-1]["extra"]["request_id"] == "abc-123"
+
+
+@pytest.mark.parametrize("request_id", ["", "a b", "x" * 129])
+def test_middleware_replaces_unsafe_request_id(request_id: str) -> None:
+    response = make_client().get("/items/1", headers={"X-Request-Id": request_id})
+    assert response.headers["X-Request-Id"] != request_id
+
+
+def test_middleware_logs_route_status_and_db_queries(records: List[dict]) -> None:
+    make_client().get("/items/1")
+
+    extra = records[-1]["extra"]
+    assert extra["route"] == "/items/{id}"
+    assert extra["status"] == 200
+    assert extra["db_queries"] == 1
+    assert extra["latency_ms"] >= extra["db_ms"] >= 0
+
+
+def test_middleware_samples_requests() -> None:
+    assert make_client(sample_rate=0).get("/items/1").json() == {"sampled": False}
+    assert make_client(sample_rate=1).get("/items/1").json() == {"sampled": True}
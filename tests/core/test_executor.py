@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from core.executor import BoundedExecutor
+from exceptions.exceptions import ServiceUnavailableError
+
+
+@pytest.mark.asyncio
+async def test_run_returns_result() -> None:
+    executor = BoundedExecutor("test", max_workers=1, max_pending=0)
+
+    assert await executor.run(pow, 2, 10) == 1024
+
+
+@pytest.mark.asyncio
+async def test_run_records_latency() -> None:
+    executor = BoundedExecutor("test", max_workers=1, max_pending=0)
+
+    await executor.run(pow, 2, 10)
+
+    stats = executor.stats()
+    assert stats["latency"]["count"] == 1
+    assert stats["rejected"] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_raises_ServiceUnavailableError_when_saturated() -> None:
+    executor = BoundedExecutor("test", max_workers=1, max_pending=1)
+    release = threading.Event()
+    running = [
+        asyncio.create_task(executor.run(release.wait)),
+        asyncio.create_task(executor.run(release.wait)),
+    ]
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceUnavailableError):
+        await executor.run(release.wait)
+
+    release.set()
+    assert await asyncio.gather(*running) == [True, True]
+    assert executor.stats()["rejected"] == 1
+    assert await executor.run(release.wait) is True
+
+
+@pytest.mark.asyncio
+async def test_slot_is_held_until_cancelled_job_finishes() -> None:
+    executor = BoundedExecutor("test", max_workers=1, max_pending=0)
+    release = threading.Event()
+    task = asyncio.create_task(executor.run(release.wait))
+    await asyncio.sleep(0)
+
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    with pytest.raises(ServiceUnavailableError):
+        await executor.run(release.wait)
+
+    release.set()
+    await asyncio.sleep(0.1)
+    assert await executor.run(release.wait) is True
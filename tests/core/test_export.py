@@ -0,0 +1,60 @@
+import csv
+import io
+import json
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from core.export import to_csv, to_ndjson
+
+Row = namedtuple("Row", ["id", "fill_date", "odometer"])
+
+BATCHES = [
+    [Row(1, date(2025, 1, 1), Decimal("123.5")), Row(2, None, Decimal("200.0"))],
+    [Row(3, date(2025, 1, 3), Decimal("456.7"))],
+]
+
+
+async def batches():
+    for rows in BATCHES:
+        yield rows
+
+
+@pytest.mark.asyncio
+async def test_to_ndjson_regular() -> None:
+    chunks = [chunk async for chunk in to_ndjson(batches(), Row._fields)]
+    lines = b"".join(chunks).decode().splitlines()
+
+    assert len(chunks) == 2
+    assert [json.loads(line) for line in lines] == [
+        {"id": 1, "fill_date": "2025-01-01", "odometer": 123.5},
+        {"id": 2, "fill_date": None, "odometer": 200.0},
+        {"id": 3, "fill_date": "2025-01-03", "odometer": 456.7},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_to_csv_regular() -> None:
+    chunks = [chunk async for chunk in to_csv(batches(), Row._fields)]
+    rows = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+
+    assert len(chunks) == 3
+    assert rows == [
+        ["id", "fill_date", "odometer"],
+        ["1", "2025-01-01", "123.5"],
+        ["2", "", "200.0"],
+        ["3", "2025-01-03", "456.7"],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_to_csv_writes_header_without_rows() -> None:
+    async def no_batches():
+        return
+        yield
+
+    chunks = [chunk async for chunk in to_csv(no_batches(), Row._fields)]
+
+    assert b"".join(chunks) == b"id,fill_date,odometer\r\n"
@@ -0,0 +1,37 @@
+import pytest
+
+from core.fields import SparseFields, select_fields, sparse_model
+from exceptions.exceptions import InvalidParameterError
+from schemas import Refill
+
+refill_fields = SparseFields(Refill)
+
+
+def test_sparse_fields_returns_None_when_not_requested() -> None:
+    assert refill_fields(None) is None
+
+
+def test_sparse_fields_orders_fields_and_adds_id() -> None:
+    assert refill_fields("cost, brand_id") == ("brand_id", "cost", "id")
+
+
+@pytest.mark.parametrize("fields", ["cost,nope", "", " , "])
+def test_sparse_fields_rejects_unknown_or_empty_fields(fields: str) -> None:
+    with pytest.raises(InvalidParameterError):
+        refill_fields(fields)
+
+
+def test_select_fields_follows_declaration_order() -> None:
+    assert select_fields(Refill, {"id", "odometer", "fill_date"}) == (
+        "fill_date",
+        "odometer",
+        "id",
+    )
+
+
+def test_sparse_model_has_only_requested_fields_and_is_cached() -> None:
+    model = sparse_model(Refill, ("cost", "id"))
+
+    assert list(model.model_fields) == ["cost", "id"]
+    assert model.model_config["strict"]
+    assert sparse_model(Refill, ("cost", "id")) is model
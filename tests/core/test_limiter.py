@@ -0,0 +1,138 @@
+from datetime import timedelta
+from typing import Optional
+
+import pytest
+from fastapi import Request
+
+from auth.utils import create_access_token
+from core.limiter import (
+    Limiter,
+    MemoryStorage,
+    Rate,
+    RouteLimit,
+    get_user_key,
+    parse_rate,
+)
+from exceptions.exceptions import RateLimitExceededError
+
+
+def make_request(headers: Optional[dict] = None) -> Request:
+    headers = headers or {}
+    return Request(
+        {
+            "type": "http",
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+            "client": ("10.0.0.1", 1234),
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "value, rate",
+    [
+        ("60/minute", Rate(60, 60)),
+        ("10/hour", Rate(10, 3600)),
+        ("5/2 days", Rate(5, 172800)),
+    ],
+)
+def test_parse_rate_regular(value: str, rate: Rate) -> None:
+    assert parse_rate(value) == rate
+
+
+@pytest.mark.parametrize("value", ["60", "0/minute", "1/fortnight"])
+def test_parse_rate_raises_ValueError(value: str) -> None:
+    with pytest.raises(ValueError):
+        parse_rate(value)
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_allows_burst_then_one_per_interval() -> None:
+    storage = MemoryStorage(max_keys=10)
+    route = RouteLimit(0, "route", Rate(3, 60))
+
+    assert [await storage.acquire(route, "k", 0.0) for _ in range(3)] == [20, 40, 60]
+    # Denied requests report the TAT they would have set, without counting
+    assert await storage.acquire(route, "k", 0.0) == pytest.approx(80.0)
+    assert await storage.acquire(route, "k", 5.0) == pytest.approx(80.0)
+    assert await storage.acquire(route, "k", 20.0) == pytest.approx(80.0)
+    assert await storage.acquire(route, "other", 20.0) == pytest.approx(40.0)
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_keeps_routes_apart() -> None:
+    storage = MemoryStorage(max_keys=10)
+    first = RouteLimit(0, "first", Rate(1, 60))
+    second = RouteLimit(1, "second", Rate(1, 60))
+
+    assert await storage.acquire(first, "k", 0.0) == 60
+    assert await storage.acquire(second, "k", 0.0) == 60
+
+
+@pytest.mark.asyncio
+async def test_memory_storage_drops_least_recently_used_keys() -> None:
+    storage = MemoryStorage(max_keys=2)
+    route = RouteLimit(0, "route", Rate(1, 60))
+
+    for key in ("a", "b", "c"):
+        await storage.acquire(route, key, 0.0)
+
+    assert await storage.acquire(route, "a", 0.0) == 60
+    assert await storage.acquire(route, "c", 0.0) > 60
+
+
+def test_get_user_key_uses_token_subject() -> None:
+    token = create_access_token({"sub": "test-user"}, timedelta(minutes=5))
+    request = make_request({"Authorization": f"Bearer {token}"})
+
+    assert get_user_key(request) == "user:test-user"
+
+
+def test_get_user_key_falls_back_to_address_for_invalid_token() -> None:
+    request = make_request({"Authorization": "Bearer not-a-token"})
+    assert get_user_key(request) == "ip:10.0.0.1"
+
+
+@pytest.mark.asyncio
+async def test_limiter_raises_RateLimitExceededError() -> None:
+    limiter = Limiter(key_func=lambda request: "key", storage=MemoryStorage(10))
+
+    @limiter.limit("2/minute")
+    async def route(request: Request) -> str:
+        return "ok"
+
+    assert await route(request=make_request()) == "ok"
+    assert await route(request=make_request()) == "ok"
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await route(request=make_request())
+    assert exc_info.value.retry_after > 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_counts_decisions_and_fill_per_route() -> None:
+    limiter = Limiter(key_func=lambda request: "key", storage=MemoryStorage(10))
+
+    @limiter.limit("2/minute")
+    async def route(request: Request) -> str:
+        return "ok"
+
+    await route(request=make_request())
+    await route(request=make_request())
+    with pytest.raises(RateLimitExceededError):
+        await route(request=make_request())
+
+    stats = limiter.stats()[f"{__name__}.route"]
+    assert (stats["allowed"], stats["denied"]) == (2, 1)
+    # Half full, then full, then throttled
+    assert stats["fill"]["buckets"][0.5] == 1
+    assert stats["fill"]["buckets"][1.0] == 3
+
+
+@pytest.mark.asyncio
+async def test_limiter_does_nothing_when_disabled() -> None:
+    limiter = Limiter(key_func=lambda request: "key", enabled=False)
+
+    @limiter.limit("1/minute")
+    async def route(request: Request) -> str:
+        return "ok"
+
+    assert [await route(request=make_request()) for _ in range(3)] == ["ok"] * 3
@@ -0,0 +1,75 @@
+import json
+
+import pytest
+from loguru import logger
+
+from core import log
+from core.context import RequestContext, request_context
+from core.log import is_sampled, json_sink
+
+
+def test_json_sink_writes_extra_and_exception(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    handler_id = logger.add(json_sink, format="{message}", colorize=False)
+    try:
+        logger.bind(request_id="abc").info("Hello {}.", "world")
+        try:
+            1 / 0
+        except ZeroDivisionError:
+            logger.exception("Failed.")
+    finally:
+        logger.remove(handler_id)
+
+    lines = capsys.readouterr().err.splitlines()
+    first, second = [json.loads(line) for line in lines[-2:]]
+    assert first["message"] == "Hello world."
+    assert first["level"] == "INFO"
+    assert first["request_id"] == "abc"
+    assert second["message"] == "Failed."
+    assert "ZeroDivisionError" in second["exception"]
+
+
+def test_is_sampled_drops_only_info_of_unsampled_requests() -> None:
+    records = {}
+    handler_id = logger.add(lambda message: records.update(message.record), level=0)
+    try:
+        logger.info("Outside a request.")
+        assert is_sampled(records)
+
+        token = request_context.set(RequestContext("abc", sampled=False))
+        try:
+            logger.info("Unsampled.")
+            assert not is_sampled(records)
+            logger.warning("Unsampled warning.")
+            assert is_sampled(records)
+        finally:
+            request_context.reset(token)
+    finally:
+        logger.remove(handler_id)
+
+
+def test_info_skips_formatting_for_unsampled_requests() -> None:
+    class Formatted:
+        calls = 0
+
+        def __format__(self, spec: str) -> str:
+            Formatted.calls += 1
+            return "value"
+
+    messages = []
+    handler_id = logger.add(lambda message: messages.append(message.record), level=0)
+    try:
+        token = request_context.set(RequestContext("abc", sampled=False))
+        try:
+            log.info("Unsampled {}.", Formatted())
+        finally:
+            request_context.reset(token)
+        log.info("Outside a request {}.", Formatted())
+    finally:
+        logger.remove(handler_id)
+
+    assert [record["message"] for record in messages] == ["Outside a request value."]
+    # Attributed to the caller rather than to `log.info`
+    assert messages[0]["name"] == __name__
+    assert Formatted.calls == 1
@@ -0,0 +1,73 @@
+import json
+from pathlib import Path
+
+from core.metrics import Family, Histogram, MetricsDirectory, merge, render
+
+
+def test_histogram_counts_observations_cumulatively() -> None:
+    histogram = Histogram(buckets=(0.1, 1.0))
+
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value)
+
+    snapshot = histogram.snapshot()
+    assert snapshot["buckets"] == {0.1: 2, 1.0: 3, float("inf"): 4}
+    assert snapshot["count"] == 4
+    assert snapshot["sum"] == 5.65
+
+
+def test_empty_histogram_snapshot() -> None:
+    snapshot = Histogram(buckets=(1.0,)).snapshot()
+
+    assert snapshot == {"buckets": {1.0: 0, float("inf"): 0}, "sum": 0.0, "count": 0}
+
+
+def test_family_renders_histogram_as_prometheus_text() -> None:
+    histogram = Histogram(buckets=(0.5,))
+    histogram.observe(0.25)
+    family = Family("latency_seconds", "histogram", "Latency.")
+
+    family.add_histogram(histogram.snapshot(), route='/a"b')
+
+    assert render([family]).splitlines() == [
+        "# HELP latency_seconds Latency.",
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{route="/a\\"b",le="0.5"} 1',
+        'latency_seconds_bucket{route="/a\\"b",le="+Inf"} 1',
+        'latency_seconds_sum{route="/a\\"b"} 0.25',
+        'latency_seconds_count{route="/a\\"b"} 1',
+    ]
+
+
+def test_merge_sums_samples_across_processes() -> None:
+    first, second = Family("hits", "counter", ""), Family("hits", "counter", "")
+    first.add(1, cache="a")
+    second.add(2, cache="a")
+    second.add(5, cache="b")
+
+    (merged,) = merge([[first], [second]])
+
+    assert merged.samples == {'hits{cache="a"}': 3, 'hits{cache="b"}': 5}
+
+
+def test_metrics_directory_archives_counters_of_exited_workers(
+    tmp_path: Path,
+) -> None:
+    directory = MetricsDirectory(str(tmp_path))
+    hits, entries = Family("hits", "counter", "Hits."), Family("entries", "gauge", "")
+    hits.add(1)
+    entries.add(3)
+    directory.write([hits, entries])
+    # No process can have this pid, so its worker has exited
+    (tmp_path / "999999999.json").write_text(
+        json.dumps([hits.__dict__, entries.__dict__])
+    )
+
+    (merged_hits, merged_entries) = merge(directory.read())
+    assert merged_hits.samples == {"hits": 2}
+    assert merged_entries.samples == {"entries": 3}
+    assert not (tmp_path / "999999999.json").exists()
+
+    directory.remove()
+    (archived,) = merge(directory.read())
+    assert archived.samples == {"hits": 2}
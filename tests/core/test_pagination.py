@@ -0,0 +1,72 @@
+import pytest
+from fastapi import Response
+
+from core.pagination import (
+    NEXT_CURSOR_HEADER,
+    Page,
+    decode_cursor,
+    encode_cursor,
+    paginate,
+)
+from exceptions.exceptions import InvalidParameterError
+
+
+class Item:
+    def __init__(self, id: int):
+        self.id = id
+
+
+def test_decode_cursor_returns_None_for_missing_cursor() -> None:
+    assert decode_cursor(None) is None
+
+
+def test_decode_cursor_raises_InvalidParameterError_for_malformed_cursor() -> None:
+    with pytest.raises(InvalidParameterError):
+        decode_cursor("not a cursor")
+    with pytest.raises(InvalidParameterError):
+        decode_cursor(encode_cursor())
+
+
+def test_decode_cursor_regular() -> None:
+    cursor = encode_cursor("2025-01-01", 42)
+
+    assert decode_cursor(cursor) == ("2025-01-01", 42)
+
+
+def test_page_after_raises_InvalidParameterError_for_non_id_cursor() -> None:
+    page = Page(after=encode_cursor("x"), limit=10)
+
+    with pytest.raises(InvalidParameterError):
+        page.after
+
+
+def test_page_after_raises_InvalidParameterError_for_out_of_range_id() -> None:
+    page = Page(after=encode_cursor(2**40), limit=10)
+
+    with pytest.raises(InvalidParameterError):
+        page.after
+
+
+def test_page_after_regular() -> None:
+    assert Page(after=None, limit=10).after is None
+    assert Page(after=encode_cursor(7), limit=10).after == 7
+
+
+def test_paginate_without_next_page() -> None:
+    response = Response()
+    items = [Item(1), Item(2)]
+
+    result = paginate(items, Page(after=None, limit=2), response)
+
+    assert [item.id for item in result] == [1, 2]
+    assert NEXT_CURSOR_HEADER not in response.headers
+
+
+def test_paginate_with_next_page() -> None:
+    response = Response()
+    items = [Item(1), Item(2), Item(3)]
+
+    result = paginate(items, Page(after=None, limit=2), response)
+
+    assert [item.id for item in result] == [1, 2]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (2,)
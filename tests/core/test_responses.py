@@ -0,0 +1,63 @@
+import json
+from collections import namedtuple
+from decimal import Decimal
+from typing import List
+
+import pytest
+from fastapi import Response
+
+from config.settings import settings
+from core.responses import fast_json, json_response, rows_response
+from schemas import Brand, Refill
+
+
+def test_json_response_serializes_schemas_and_keeps_headers() -> None:
+    response = Response()
+    response.headers["X-Next-Cursor"] = "abc"
+
+    result = json_response([Brand(id=1, name="x")], response, List[Brand])
+
+    assert result.body == b'[{"name":"x","id":1}]'
+    assert result.media_type == "application/json"
+    assert result.headers["X-Next-Cursor"] == "abc"
+
+
+def test_rows_response_serializes_rows_as_schema() -> None:
+    Row = namedtuple("Row", ["odometer", "cost", "id"])
+
+    result = rows_response(
+        [Row(Decimal("123.5"), Decimal("20.50"), 1)], Refill, Response()
+    )
+
+    assert json.loads(result.body) == [{"odometer": 123.5, "cost": 20.5, "id": 1}]
+
+
+def test_rows_response_returns_only_requested_fields() -> None:
+    Row = namedtuple("Row", ["odometer", "cost", "id"])
+
+    result = rows_response(
+        [Row(Decimal("123.5"), Decimal("20.50"), 1)], Refill, Response(), ("cost", "id")
+    )
+
+    assert json.loads(result.body) == [{"cost": 20.5, "id": 1}]
+
+
+def test_rows_response_serializes_no_rows() -> None:
+    assert rows_response([], Refill, Response()).body == b"[]"
+
+
+def test_fast_json_returns_content_as_is_when_off(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "fast_json", False)
+    content = [Brand(id=1, name="x")]
+
+    assert fast_json(content, List[Brand], Response()) is content
+
+
+def test_fast_json_serializes_content_when_on(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "fast_json", True)
+
+    result = fast_json([Brand(id=1, name="x")], List[Brand], Response())
+
+    assert result.body == b'[{"name":"x","id":1}]'
@@ -0,0 +1,48 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from core.context import RequestContextMiddleware
+from core.timing import (
+    ServerTimingMiddleware,
+    TimedRoute,
+    format_server_timing,
+    timed,
+    timing_stats,
+)
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.add_middleware(RequestContextMiddleware)
+    router = APIRouter(prefix="/timed", route_class=TimedRoute)
+
+    @router.get("/{id}")
+    async def read_item(id: int) -> dict:
+        with timed("validate"):
+            return {"id": id}
+
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_format_server_timing() -> None:
+    assert format_server_timing({"db": 0.0012, "total": 0.5}) == (
+        "db;dur=1.20, total;dur=500.00"
+    )
+
+
+def test_timed_does_nothing_outside_a_request() -> None:
+    with timed("validate"):
+        pass
+
+
+def test_server_timing_middleware_returns_and_records_phases() -> None:
+    response = make_client().get("/timed/1")
+
+    header = response.headers["Server-Timing"]
+    phases = [entry.split(";")[0] for entry in header.split(", ")]
+    assert sorted(phases) == ["db", "handler", "serialize", "total", "validate"]
+    stats = timing_stats()["/timed/{id}"]
+    assert stats["total"]["count"] >= 1
+    assert stats["validate"]["count"] >= 1
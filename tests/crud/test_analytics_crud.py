@@ -0,0 +1,141 @@
+from datetime import date
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from crud import analytics, rollups
+from exceptions.exceptions import InvalidParameterError
+from schemas import RefillEconomy, RefillMonthlySummary
+
+
+async def setup(async_session: AsyncSession) -> None:
+    test_brand_1 = models.Brand(id=1, name="x")
+    test_brand_2 = models.Brand(id=2, name="y")
+    test_octane = models.Octane(id=1, grade=91)
+    async_session.add_all([test_brand_1, test_brand_2, test_octane])
+    await async_session.commit()
+
+    async_session.add_all(
+        [
+            models.Refill(
+                id=1,
+                fill_date=date(2025, 1, 1),
+                odometer=1000,
+                liters_filled=10,
+                brand_id=1,
+                octane_id=1,
+                ethanol_percent=0.1,
+                cost=500,
+            ),
+            models.Refill(
+                id=2,
+                fill_date=date(2025, 1, 15),
+                odometer=1150,
+                liters_filled=10,
+                brand_id=2,
+                octane_id=1,
+                ethanol_percent=0.1,
+                cost=600,
+            ),
+            models.Refill(
+                id=3,
+                fill_date=date(2025, 2, 1),
+                odometer=1350,
+                liters_filled=8,
+                brand_id=1,
+                octane_id=1,
+                ethanol_percent=0.1,
+                cost=400,
+            ),
+        ]
+    )
+    await async_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_read_economy_returns_empty_list(testing_session: AsyncSession) -> None:
+    assert await analytics.read_economy(testing_session) == []
+
+
+@pytest.mark.asyncio
+async def test_read_economy_regular(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+
+    result = await analytics.read_economy(testing_session)
+
+    assert all(isinstance(item, RefillEconomy) for item in result)
+    assert [item.refill_id for item in result] == [1, 2, 3]
+    assert result[0].distance is None
+    assert result[0].km_per_liter is None
+    assert result[0].price_per_liter == 50
+    assert result[1].distance == 150
+    assert result[1].km_per_liter == 15
+    assert result[1].cost_per_km == 4
+    assert result[2].distance == 200
+    assert result[2].km_per_liter == 25
+    assert result[2].cost_per_km == 2
+
+
+@pytest.mark.asyncio
+async def test_read_economy_filters_after_computing_distances(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    by_brand = await analytics.read_economy(testing_session, brand_id=1)
+    by_date = await analytics.read_economy(
+        testing_session, date_from=date(2025, 1, 10), date_to=date(2025, 1, 31)
+    )
+
+    assert [item.refill_id for item in by_brand] == [1, 3]
+    assert by_brand[1].distance == 200
+    assert [item.refill_id for item in by_date] == [2]
+    assert by_date[0].distance == 150
+
+
+@pytest.mark.asyncio
+async def test_read_economy_pages_by_odometer(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+
+    first = await analytics.read_economy(testing_session, limit=2)
+    rest = await analytics.read_economy(
+        testing_session, after=analytics.economy_key(first[-1]), limit=2
+    )
+
+    assert [item.refill_id for item in first] == [1, 2]
+    assert [item.refill_id for item in rest] == [3]
+    assert rest[0].distance == 200
+
+
+@pytest.mark.asyncio
+async def test_read_economy_rejects_improper_cursor(
+    testing_session: AsyncSession,
+) -> None:
+    with pytest.raises(InvalidParameterError):
+        await analytics.read_economy(testing_session, after=("x", 1))
+    with pytest.raises(InvalidParameterError):
+        await analytics.read_economy(testing_session, after=(1000.0, 2**40))
+
+
+@pytest.mark.asyncio
+async def test_read_monthly_regular(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+    await rollups.rebuild_refills_monthly(testing_session)
+
+    result = await analytics.read_monthly(testing_session)
+    by_brand = await analytics.read_monthly(
+        testing_session, date_from=date(2025, 1, 20), brand_id=1
+    )
+
+    assert all(isinstance(item, RefillMonthlySummary) for item in result)
+    assert [(item.month, item.brand_id) for item in result] == [
+        (date(2025, 1, 1), 1),
+        (date(2025, 1, 1), 2),
+        (date(2025, 2, 1), 1),
+    ]
+    assert result[0].price_per_liter == 50
+    assert [(item.month, item.refill_count) for item in by_brand] == [
+        (date(2025, 1, 1), 1),
+        (date(2025, 2, 1), 1),
+    ]
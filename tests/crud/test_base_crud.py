@@ -0,0 +1,99 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from crud.base import (
+    delete_returning,
+    find_by_ids,
+    insert_many_returning,
+    insert_returning,
+    update_returning,
+)
+
+
+async def setup(async_session: AsyncSession) -> None:
+    test_brand = models.Brand(id=1, name="test brand")
+    other_brand = models.Brand(id=2, name="other brand")
+    async_session.add_all([test_brand, other_brand])
+    await async_session.commit()
+
+
+@pytest.mark.asyncio
+async def test_insert_returning_regular(testing_session: AsyncSession) -> None:
+    row = await insert_returning(models.Brand, {"name": "new brand"}, testing_session)
+
+    assert row.id == 1
+    assert row.name == "new brand"
+
+
+@pytest.mark.asyncio
+async def test_insert_many_returning_preserves_order(
+    testing_session: AsyncSession,
+) -> None:
+    names = [f"brand {i}" for i in range(5)]
+
+    rows = await insert_many_returning(
+        models.Brand, [{"name": name} for name in names], testing_session
+    )
+
+    assert [row.name for row in rows] == names
+    assert [row.id for row in rows] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_update_returning_returns_None_for_nonexistent_row(
+    testing_session: AsyncSession,
+) -> None:
+    row = await update_returning(models.Brand, 404, {"name": "x"}, testing_session)
+
+    assert row is None
+
+
+@pytest.mark.asyncio
+async def test_update_returning_without_values_returns_current_row(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    row = await update_returning(models.Brand, 2, {}, testing_session)
+
+    assert row.name == "other brand"
+
+
+@pytest.mark.asyncio
+async def test_update_returning_regular(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+
+    row = await update_returning(models.Brand, 2, {"name": "x"}, testing_session)
+
+    assert row.id == 2
+    assert row.name == "x"
+
+
+@pytest.mark.asyncio
+async def test_delete_returning_returns_None_for_nonexistent_row(
+    testing_session: AsyncSession,
+) -> None:
+    assert await delete_returning(models.Brand, 404, testing_session) is None
+
+
+@pytest.mark.asyncio
+async def test_delete_returning_regular(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+
+    row = await delete_returning(models.Brand, 1, testing_session)
+
+    assert row.id == 1
+    assert row.name == "test brand"
+    assert await testing_session.get(models.Brand, 1) is None
+
+
+@pytest.mark.asyncio
+async def test_find_by_ids_returns_existing_rows_sorted(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    rows = await find_by_ids(models.Brand, [3, 2, 1], testing_session)
+
+    assert [row.id for row in rows] == [1, 2]
@@ -212,3 +212,60 @@ async def test_delete_brand_regular(
     assert len(table_contents) == 1
     assert isinstance(table_contents[0], Brand)
     assert table_contents[0].name == "other brand"
+
+
+@pytest.mark.asyncio
+async def test_read_brands_is_served_from_cache(
+    testing_session: AsyncSession,
+) -> None:
+    # Added through the crud layer, which moves the id sequence as the API would
+    for name in ("test brand", "other brand"):
+        await brands.create_brand(BrandCreate(name=name), testing_session)
+    hits, misses = brands.cache.hits, brands.cache.misses
+
+    first = await brands.read_brands(testing_session)
+    second = await brands.read_brands(testing_session, after=1)
+    await brands.create_brand(BrandCreate(name="new brand"), testing_session)
+    third = await brands.read_brands(testing_session)
+
+    assert [brand.id for brand in first] == [1, 2]
+    assert [brand.id for brand in second] == [2]
+    assert [brand.id for brand in third] == [1, 2, 3]
+    assert brands.cache.hits - hits == 1
+    assert brands.cache.misses - misses == 2
+
+
+@pytest.mark.asyncio
+async def test_read_brands_by_ids_skips_missing_and_uses_cache(
+    testing_session: AsyncSession,
+) -> None:
+    # Add test brands
+    await setup(testing_session)
+    await brands.read_brand(2, testing_session)
+    hits = brands.cache.hits
+
+    result = await brands.read_brands_by_ids([1, 2, 3], testing_session)
+
+    assert [brand.id for brand in result] == [1, 2]
+    assert result[0].name == "test brand"
+    assert brands.cache.hits - hits == 1
+    assert brands.cache.get(1) == result[0]
+
+
+@pytest.mark.asyncio
+async def test_read_brand_does_not_cache_a_row_evicted_while_reading(
+    testing_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    await setup(testing_session)
+    find_brand = brands.find_brand
+
+    async def find_brand_during_update(id: int, session: AsyncSession):
+        db_brand = await find_brand(id, session)
+        # An update commits and evicts while the read is waiting on the database
+        brands.cache.evict(id)
+        return db_brand
+
+    monkeypatch.setattr(brands, "find_brand", find_brand_during_update)
+    await brands.read_brand(1, testing_session)
+
+    assert brands.cache.get(1) is None
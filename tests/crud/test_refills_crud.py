@@ -1,3 +1,4 @@
+from collections import namedtuple
 from datetime import date, timedelta
 from decimal import Decimal
 
@@ -6,12 +7,14 @@ from pydantic import ValidationError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import models
+from core.pagination import decode_cursor, encode_cursor
 from crud import refills
 from exceptions.exceptions import (
     EntityDoesNotExistError,
+    InvalidParameterError,
     RelatedEntityDoesNotExistError,
 )
-from schemas import Refill, RefillCreate, RefillUpdate
+from schemas import Refill, RefillCreate, RefillFilter, RefillUpdate
 
 
 async def setup_dimension_tables(async_session: AsyncSession) -> None:
@@ -170,6 +173,80 @@ async def test_create_refill_regular(testing_session: AsyncSession) -> None:
     assert result.cost == 175
 
 
+@pytest.mark.asyncio
+async def test_create_refills_raises_RelatedEntityDoesNotExistError(
+    testing_session: AsyncSession,
+) -> None:
+    await setup_dimension_tables(testing_session)
+
+    with pytest.raises(RelatedEntityDoesNotExistError, match="Brand"):
+        await refills.create_refills(
+            [
+                RefillCreate(
+                    odometer=123,
+                    liters_filled=1.23,
+                    brand_id=1000,
+                    octane_id=1,
+                    ethanol_percent=0.1,
+                    cost=200.5,
+                )
+            ],
+            testing_session,
+        )
+
+    assert await refills.find_refills(testing_session) == []
+
+
+@pytest.mark.asyncio
+async def test_create_refills_reports_errors_in_partial_mode(
+    testing_session: AsyncSession,
+) -> None:
+    await setup_dimension_tables(testing_session)
+    valid = dict(odometer=123, liters_filled=3.5, ethanol_percent=0.1, cost=175)
+
+    result = await refills.create_refills(
+        [
+            RefillCreate(brand_id=1, octane_id=1, **valid),
+            RefillCreate(brand_id=1000, octane_id=1, **valid),
+            RefillCreate(brand_id=2, octane_id=1000, **valid),
+            RefillCreate(brand_id=2, octane_id=2, fill_date=date(2025, 1, 1), **valid),
+        ],
+        testing_session,
+        partial=True,
+    )
+
+    assert [refill.id for refill in result.created] == [1, 2]
+    assert result.created[0].fill_date == date.today()
+    assert result.created[1].fill_date == date(2025, 1, 1)
+    assert [error.index for error in result.errors] == [1, 2]
+    assert "Brand" in result.errors[0].detail
+    assert "Octane" in result.errors[1].detail
+
+
+@pytest.mark.asyncio
+async def test_create_refills_regular(testing_session: AsyncSession) -> None:
+    await setup_dimension_tables(testing_session)
+
+    result = await refills.create_refills(
+        [
+            RefillCreate(
+                odometer=123 + i,
+                liters_filled=3.5,
+                brand_id=1,
+                octane_id=2,
+                ethanol_percent=0.12,
+                cost=175,
+            )
+            for i in range(3)
+        ],
+        testing_session,
+    )
+
+    assert [refill.id for refill in result.created] == [1, 2, 3]
+    assert [refill.odometer for refill in result.created] == [123, 124, 125]
+    assert result.errors == []
+
+
 @pytest.mark.asyncio
 async def test_find_refill_raises_EntityDoesNotExistError(
     testing_session: AsyncSession,
@@ -237,6 +314,109 @@ async def test_find_refills_regular(
     assert result[1].cost == 200.5
 
 
+@pytest.mark.asyncio
+async def test_find_refills_paginates(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    first_page = await refills.find_refills(testing_session, limit=1)
+    second_page = await refills.find_refills(testing_session, after=1, limit=1)
+    last_page = await refills.find_refills(testing_session, after=2, limit=1)
+
+    assert [refill.id for refill in first_page] == [1]
+    assert [refill.id for refill in second_page] == [2]
+    assert last_page == []
+
+
+@pytest.mark.asyncio
+async def test_find_refills_filters(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    by_cost = await refills.find_refills(
+        testing_session, filters=RefillFilter(brand_id=1, min_cost=180)
+    )
+    by_date = await refills.find_refills(
+        testing_session,
+        filters=RefillFilter(date_from=date.today() + timedelta(days=1)),
+    )
+    by_ethanol = await refills.find_refills(
+        testing_session, filters=RefillFilter(min_ethanol=0.05, max_ethanol=0.2)
+    )
+    by_octane = await refills.find_refills(
+        testing_session, filters=RefillFilter(octane_id=2, max_cost=100)
+    )
+
+    assert [refill.id for refill in by_cost] == [2]
+    assert [refill.id for refill in by_date] == [2]
+    assert [refill.id for refill in by_ethanol] == [1]
+    assert by_octane == []
+
+
+def test_refill_sort_key_encodes_decimal_values_of_raw_rows() -> None:
+    Row = namedtuple("Row", ["id", "odometer"])
+    key = refills.refill_sort_key(RefillFilter(sort="-odometer"))
+
+    value = key(Row(2, Decimal("123.5")))
+
+    assert value == (123.5, 2)
+    assert decode_cursor(encode_cursor(*value)) == value
+
+
+@pytest.mark.asyncio
+async def test_find_refills_sorts_and_paginates_by_column(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+    filters = RefillFilter(sort="-odometer")
+    key = refills.refill_sort_key(filters)
+
+    first_page = await refills.find_refills(testing_session, limit=1, filters=filters)
+    second_page = await refills.find_refills(
+        testing_session, after=key(first_page[0]), limit=1, filters=filters
+    )
+    by_date = await refills.find_refills(
+        testing_session, filters=RefillFilter(sort="-fill_date")
+    )
+
+    assert [refill.id for refill in first_page] == [2]
+    assert [refill.id for refill in second_page] == [1]
+    assert [refill.id for refill in by_date] == [2, 1]
+
+
+@pytest.mark.asyncio
+async def test_find_refills_raises_InvalidParameterError_for_bad_keyset(
+    testing_session: AsyncSession,
+) -> None:
+    with pytest.raises(InvalidParameterError):
+        await refills.find_refills(
+            testing_session,
+            after=("yesterday", 1),
+            filters=RefillFilter(sort="fill_date"),
+        )
+    with pytest.raises(InvalidParameterError):
+        await refills.find_refills(
+            testing_session,
+            after=("2025-01-01", 2**40),
+            filters=RefillFilter(sort="fill_date"),
+        )
+
+
+@pytest.mark.asyncio
+async def test_stream_refills_regular(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    batches = [rows async for rows in refills.stream_refills(testing_session, 1)]
+
+    assert len(batches) == 2
+    assert [row.id for rows in batches for row in rows] == [1, 2]
+    assert batches[0][0].odometer == Decimal("123.5")
+
+
 @pytest.mark.asyncio
 async def test_read_refill_raises_EntityDoesNotExistError(
     testing_session: AsyncSession,
@@ -448,3 +628,28 @@ async def test_delete_refill_regular(
 
     assert len(table_contents) == 1
     assert table_contents[0].id == 2
+
+
+@pytest.mark.asyncio
+async def test_read_refills_by_ids_regular(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+
+    result = await refills.read_refills_by_ids([2, 1, 5], testing_session)
+    sparse = await refills.read_refills_by_ids([2], testing_session, ("cost", "id"))
+
+    assert [refill.id for refill in result] == [1, 2]
+    assert isinstance(result[0], Refill)
+    assert sparse[0].model_dump() == {"cost": result[1].cost, "id": 2}
+
+
+@pytest.mark.asyncio
+async def test_read_refills_leaves_out_unrequested_sort_column(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+
+    result = await refills.read_refills(
+        testing_session, filters=RefillFilter(sort="-odometer"), fields=("cost",)
+    )
+
+    assert all(refill.model_dump().keys() == {"cost", "id"} for refill in result)
@@ -0,0 +1,146 @@
+from collections import namedtuple
+from datetime import date
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+from crud import refills, rollups
+from schemas import RefillCreate, RefillUpdate
+
+
+async def setup(async_session: AsyncSession) -> None:
+    async_session.add_all(
+        [
+            models.Brand(id=1, name="x"),
+            models.Brand(id=2, name="y"),
+            models.Octane(id=1, grade=91),
+        ]
+    )
+    await async_session.commit()
+
+
+def refill_params(fill_date: date, brand_id: int = 1) -> RefillCreate:
+    return RefillCreate(
+        fill_date=fill_date,
+        odometer=1000.0,
+        liters_filled=10.0,
+        brand_id=brand_id,
+        octane_id=1,
+        ethanol_percent=0.1,
+        cost=500.0,
+    )
+
+
+async def read_rollup(async_session: AsyncSession) -> list:
+    stmt = select(
+        models.RefillMonthly.month,
+        models.RefillMonthly.brand_id,
+        models.RefillMonthly.refill_count,
+        models.RefillMonthly.liters_filled,
+        models.RefillMonthly.cost,
+    ).order_by(models.RefillMonthly.month, models.RefillMonthly.brand_id)
+    return [tuple(row) for row in (await async_session.execute(stmt)).all()]
+
+
+@pytest.mark.asyncio
+async def test_create_refills_adds_to_rollup(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+
+    await refills.create_refill(refill_params(date(2025, 1, 5)), testing_session)
+    await refills.create_refills(
+        [refill_params(date(2025, 1, 20)), refill_params(date(2025, 2, 1), 2)],
+        testing_session,
+    )
+
+    assert await read_rollup(testing_session) == [
+        (date(2025, 1, 1), 1, 2, 20, 1000),
+        (date(2025, 2, 1), 2, 1, 10, 500),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_update_refill_moves_totals_in_rollup(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+    refill = await refills.create_refill(
+        refill_params(date(2025, 1, 5)), testing_session
+    )
+
+    await refills.update_refill(
+        refill.id, RefillUpdate(fill_date=date(2025, 2, 5), cost=300.0), testing_session
+    )
+
+    assert await read_rollup(testing_session) == [
+        (date(2025, 1, 1), 1, 0, 0, 0),
+        (date(2025, 2, 1), 1, 1, 10, 300),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_delete_refill_subtracts_from_rollup(
+    testing_session: AsyncSession,
+) -> None:
+    await setup(testing_session)
+    refill = await refills.create_refill(
+        refill_params(date(2025, 1, 5)), testing_session
+    )
+    await refills.create_refill(refill_params(date(2025, 1, 6)), testing_session)
+
+    await refills.delete_refill(refill.id, testing_session)
+
+    assert await read_rollup(testing_session) == [(date(2025, 1, 1), 1, 1, 10, 500)]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_refills_monthly_regular(testing_session: AsyncSession) -> None:
+    await setup(testing_session)
+    testing_session.add_all(
+        [
+            models.Refill(
+                id=id,
+                fill_date=fill_date,
+                odometer=1000,
+                liters_filled=10,
+                brand_id=1,
+                octane_id=1,
+                ethanol_percent=0.1,
+                cost=500,
+            )
+            for id, fill_date in [(1, date(2025, 1, 5)), (2, date(2025, 1, 9))]
+        ]
+    )
+    await testing_session.commit()
+
+    count = await rollups.rebuild_refills_monthly(testing_session)
+
+    assert count == 1
+    assert await read_rollup(testing_session) == [(date(2025, 1, 1), 1, 2, 20, 1000)]
+
+
+@pytest.mark.asyncio
+async def test_apply_refill_deltas_upserts_months_in_key_order() -> None:
+    class Session:
+        async def execute(self, stmt):
+            self.params = stmt.compile(dialect=postgresql.dialect()).params
+
+    Row = namedtuple("Row", "fill_date brand_id octane_id liters_filled cost")
+    session = Session()
+
+    await rollups.apply_refill_deltas(
+        session,
+        added=[
+            Row(date(2025, 2, 3), 1, 1, 10, 500),
+            Row(date(2025, 1, 3), 2, 1, 10, 500),
+            Row(date(2025, 1, 9), 1, 1, 10, 500),
+        ],
+    )
+
+    keys = [
+        (session.params[f"month_m{i}"], session.params[f"brand_id_m{i}"])
+        for i in range(3)
+    ]
+    assert keys == [(date(2025, 1, 1), 1), (date(2025, 1, 1), 2), (date(2025, 2, 1), 1)]
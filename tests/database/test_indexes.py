@@ -0,0 +1,56 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import Select, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import models
+
+refill = models.Refill
+
+
+async def explain(session: AsyncSession, stmt: Select) -> str:
+    # With a handful of rows a sequential scan is always cheapest, so rule it out
+    # to see which index the planner would pick on a real table
+    await session.execute(text("SET LOCAL enable_seqscan = off"))
+    compiled = stmt.compile(
+        dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    rows = (await session.execute(text(f"EXPLAIN {compiled}"))).scalars().all()
+    return "\n".join(rows)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "stmt, index",
+    [
+        (
+            select(refill.id)
+            .where(refill.fill_date.between(date(2025, 1, 1), date(2025, 1, 31)))
+            .order_by(refill.fill_date, refill.id),
+            "ix_fct_refills_fill_date",
+        ),
+        (
+            select(refill.liters_filled, refill.cost).where(
+                refill.brand_id == 1, refill.fill_date >= date(2025, 1, 1)
+            ),
+            "ix_fct_refills_brand_id_fill_date",
+        ),
+        (
+            select(refill.liters_filled, refill.cost).where(
+                refill.octane_id == 1, refill.fill_date >= date(2025, 1, 1)
+            ),
+            "ix_fct_refills_octane_id_fill_date",
+        ),
+        (
+            select(refill.id).where(refill.brand_id == 1),
+            "ix_fct_refills_brand_id_fill_date",
+        ),
+    ],
+)
+async def test_hot_refill_queries_use_indexes(
+    testing_session: AsyncSession, stmt: Select, index: str
+) -> None:
+    plan = await explain(testing_session, stmt)
+
+    assert index in plan
@@ -0,0 +1,67 @@
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from core.cache import get_cache
+from database.invalidation import (
+    handle_invalidation,
+    listen_for_invalidations,
+    publish_invalidation,
+)
+
+
+def test_handle_invalidation_evicts_entry_and_collection() -> None:
+    cache = get_cache("test-invalidation")
+    cache.set(1, "one")
+    cache.set(2, "two")
+    cache.set("all", ["one", "two"])
+
+    handle_invalidation(json.dumps({"entity": "test-invalidation", "id": 1}))
+
+    assert cache.get(1) is None
+    assert cache.get("all") is None
+    assert cache.get(2) == "two"
+
+
+def test_handle_invalidation_without_id_clears_cache() -> None:
+    cache = get_cache("test-invalidation")
+    cache.set(1, "one")
+
+    handle_invalidation(json.dumps({"entity": "test-invalidation", "id": None}))
+
+    assert len(cache) == 0
+
+
+def test_handle_invalidation_ignores_malformed_payload() -> None:
+    cache = get_cache("test-invalidation")
+    cache.set(1, "one")
+
+    handle_invalidation("not json")
+    handle_invalidation(json.dumps({"id": 1}))
+
+    assert cache.get(1) == "one"
+
+
+@pytest.mark.asyncio
+async def test_listener_evicts_on_committed_notification(
+    engine: AsyncEngine, testing_session: AsyncSession
+) -> None:
+    cache = get_cache("test-invalidation")
+    cache.set(1, "one")
+    listener = asyncio.create_task(listen_for_invalidations(engine))
+    await asyncio.sleep(0.5)
+
+    try:
+        await publish_invalidation(testing_session, "test-invalidation", 1)
+        await testing_session.rollback()
+        await asyncio.sleep(0.5)
+        assert cache.get(1) == "one"
+
+        await publish_invalidation(testing_session, "test-invalidation", 1)
+        await testing_session.commit()
+        await asyncio.sleep(0.5)
+        assert cache.get(1) is None
+    finally:
+        listener.cancel()
@@ -1,14 +1,23 @@
+import asyncio
+import fcntl
+import threading
+import time
 from datetime import datetime
+from pathlib import Path
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 from pydantic import SecretStr
 from sqlalchemy.ext.asyncio import AsyncSession
 
+import main
 import models
+from api.routes import metrics
 from auth.dependencies import get_current_active_user
 from auth.models import DBUser, User
-from auth.utils import create_access_token, get_password_hash
+from auth.utils import create_access_token, get_password_hash, password_executor
+from core.executor import BoundedExecutor
+from core.metrics import MetricsDirectory
 from database.session import DatabaseSessionManager, get_db_session
 from main import app
 
@@ -177,6 +186,124 @@ async def test_login_returns_http_401_for_invalid_password(
     assert "Invalid username or password" in response.text
 
 
+@pytest.mark.asyncio
+async def test_login_returns_http_503_when_password_executor_is_saturated(
+    testing_data: dict,
+    testing_session: AsyncSession,
+    async_client: AsyncClient,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    await setup_users(testing_data, testing_session)
+    monkeypatch.setattr(password_executor, "_slots", threading.Semaphore(0))
+
+    form_data = {
+        "username": testing_data["user"]["username"],
+        "password": testing_data["user"]["password"],
+    }
+    response = await async_client.post(
+        "/api/auth/token",
+        data=form_data,
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    assert response.status_code == 503
+    assert "Server is busy" in response.text
+
+
+@pytest.mark.asyncio
+async def test_main_returns_http_429_when_rate_limit_is_exceeded(
+    async_client: AsyncClient,
+) -> None:
+    # Brands are limited to 60/minute
+    for _ in range(60):
+        response = await async_client.get(URL_PREFIX + "brands/")
+        assert response.status_code == 200
+
+    response = await async_client.get(URL_PREFIX + "brands/")
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+
+
+@pytest.mark.asyncio
+async def test_lifespan_shuts_down_password_executor(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    executor = BoundedExecutor("test", max_workers=1, max_pending=0)
+    monkeypatch.setattr(main, "password_executor", executor)
+    monkeypatch.setattr(main.sessionmanager, "engine", None)
+
+    async with main.lifespan(app):
+        assert await executor.run(sum, [1, 2]) == 3
+
+    with pytest.raises(RuntimeError):
+        await executor.run(sum, [1, 2])
+
+
+@pytest.mark.asyncio
+async def test_metrics_returns_prometheus_text(async_client: AsyncClient) -> None:
+    await async_client.get(URL_PREFIX + "brands/")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "# TYPE naviconomy_http_request_duration_seconds histogram" in response.text
+    assert 'naviconomy_http_request_duration_seconds_count{route="/brands/"' in (
+        response.text
+    )
+    assert "naviconomy_db_query_duration_seconds_count" in response.text
+
+
+@pytest.mark.asyncio
+async def test_metrics_waits_for_the_shared_directory_off_the_event_loop(
+    async_client: AsyncClient, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(metrics, "directory", MetricsDirectory(str(tmp_path)))
+
+    # Another worker holds the lock for a second, e.g. while folding the archive
+    with open(tmp_path / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        threading.Timer(1, fcntl.flock, (lock, fcntl.LOCK_UN)).start()
+        scrape = asyncio.create_task(async_client.get("/metrics"))
+        start = time.perf_counter()
+        await asyncio.sleep(0.1)
+        assert time.perf_counter() - start < 0.5
+        response = await scrape
+
+    assert response.status_code == 200
+    assert "naviconomy_db_query_duration_seconds_count" in response.text
+
+
+@pytest.mark.asyncio
+async def test_main_returns_http_400_for_invalid_cursor(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(
+        URL_PREFIX + "refills/", params={"after": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+    assert "Invalid pagination cursor" in response.text
+
+
+@pytest.mark.asyncio
+async def test_main_returns_http_400_for_unknown_field(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(
+        URL_PREFIX + "refills/", params={"fields": "id,password"}
+    )
+    assert response.status_code == 400
+    assert "Unknown fields: password." in response.text
+
+
+@pytest.mark.asyncio
+async def test_main_returns_http_400_for_improper_ids(
+    async_client: AsyncClient,
+) -> None:
+    response = await async_client.get(URL_PREFIX + "brands/", params={"ids": "1,x"})
+    assert response.status_code == 400
+
+
 @pytest.mark.asyncio
 async def test_main_returns_http_401_for_invalid_token(
     testing_session: AsyncSession,